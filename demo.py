@@ -8,24 +8,29 @@ Perfect for portfolio demonstrations and testing.
 Run with: python demo.py
 """
 
+import os
 import sys
 import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from rich.console import Console
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from src.config import Config
-from src.agents.supervisor import PersonalAssistant
+from src.ui.console import console
 
+if TYPE_CHECKING:
+    from src.agents.supervisor import PersonalAssistant
 
-console = Console()
+
+# Seconds to pause between demos (set DEMO_PACE for presentations)
+PACE = float(os.environ.get("DEMO_PACE", "0"))
 
 
 def print_header():
@@ -47,7 +52,7 @@ Built with **LangChain** and **Google Gemini**.
     ))
 
 
-def demo_request(assistant: PersonalAssistant, request: str, description: str):
+def demo_request(assistant: "PersonalAssistant", request: str, description: str):
     """Execute a demo request and display results."""
     console.print()
     console.print(Panel(
@@ -67,15 +72,18 @@ def demo_request(assistant: PersonalAssistant, request: str, description: str):
     ) as progress:
         progress.add_task(description="Processing with AI agents...", total=None)
         
+        start = time.perf_counter()
         try:
             response = assistant.chat(request)
         except Exception as e:
             response = f"❌ Error: {str(e)}"
+        elapsed_ms = (time.perf_counter() - start) * 1000
     
     # Display response
     console.print(Panel(
         Markdown(response),
         title="[green]Assistant Response[/green]",
+        subtitle=f"[dim]{elapsed_ms:.0f} ms[/dim]",
         border_style="green",
         padding=(1, 2),
     ))
@@ -103,7 +111,10 @@ def run_demo():
     console.print("\n[cyan]Initializing Personal Assistant...[/cyan]")
     
     try:
-        assistant = PersonalAssistant(name="Demo Assistant")
+        # Imported here so the header renders before the LLM stack loads
+        from src.agents.supervisor import PersonalAssistant
+        
+        assistant = PersonalAssistant(name="Demo Assistant", fresh=True)
         console.print("[green]✅ Assistant initialized successfully![/green]\n")
     except Exception as e:
         console.print(f"[red]Failed to initialize: {e}[/red]")
@@ -119,7 +130,8 @@ def run_demo():
             "What's on my calendar for the next 3 days?",
             "📅 Demo 1: Viewing Calendar",
         )
-        time.sleep(2)
+        if PACE:
+            time.sleep(PACE)
     except KeyboardInterrupt:
         console.print("\n[yellow]Skipped.[/yellow]")
     
@@ -130,7 +142,8 @@ def run_demo():
             "Am I free tomorrow afternoon between 2pm and 5pm?",
             "📅 Demo 2: Checking Availability", 
         )
-        time.sleep(2)
+        if PACE:
+            time.sleep(PACE)
     except KeyboardInterrupt:
         console.print("\n[yellow]Skipped.[/yellow]")
     
@@ -141,7 +154,8 @@ def run_demo():
             "Schedule a team sync meeting for tomorrow at 3pm for 30 minutes",
             "📅 Demo 3: Creating Calendar Event",
         )
-        time.sleep(2)
+        if PACE:
+            time.sleep(PACE)
     except KeyboardInterrupt:
         console.print("\n[yellow]Skipped.[/yellow]")
     
@@ -152,7 +166,8 @@ def run_demo():
             "Search for recent emails in my inbox",
             "📧 Demo 4: Searching Emails",
         )
-        time.sleep(2)
+        if PACE:
+            time.sleep(PACE)
     except KeyboardInterrupt:
         console.print("\n[yellow]Skipped.[/yellow]")
     
@@ -163,7 +178,8 @@ def run_demo():
             "Draft an email to demo@example.com about the project status update",
             "📧 Demo 5: Drafting Email",
         )
-        time.sleep(2)
+        if PACE:
+            time.sleep(PACE)
     except KeyboardInterrupt:
         console.print("\n[yellow]Skipped.[/yellow]")
     
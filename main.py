@@ -6,38 +6,28 @@ A multi-agent personal assistant with Google Calendar and Gmail integration.
 Run with: python main.py
 """
 
+import argparse
 import sys
+import threading
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 # Add project root to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from rich.console import Console
+from rich.live import Live
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.prompt import Prompt, Confirm
 from rich.text import Text
-from rich.theme import Theme
-from prompt_toolkit import prompt
+from prompt_toolkit import PromptSession
 from prompt_toolkit.history import FileHistory
 from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
 
 from src.config import Config
-from src.agents.supervisor import PersonalAssistant
-
-
-# Custom theme for rich console
-custom_theme = Theme({
-    "info": "cyan",
-    "warning": "yellow",
-    "error": "red bold",
-    "success": "green",
-    "user": "bold blue",
-    "assistant": "bold magenta",
-})
-
-console = Console(theme=custom_theme)
+from src.ui.console import console
 
 
 def display_welcome():
@@ -99,9 +89,42 @@ def display_help():
     console.print(Markdown(help_text))
 
 
-def check_configuration() -> bool:
+@dataclass
+class StartupState:
+    """Configuration and OAuth file status, checked once per CLI session."""
+    missing_config: list[str]
+    credentials_found: bool
+    token_found: bool
+
+
+_startup_state: Optional[StartupState] = None
+
+
+def get_startup_state(refresh: bool = False) -> StartupState:
+    """
+    Get the startup state, checking the environment and files only once.
+    
+    Args:
+        refresh: Re-check instead of returning the cached state.
+        
+    Returns:
+        The current StartupState.
+    """
+    global _startup_state
+    if _startup_state is None or refresh:
+        from src.config import get_credentials_path, get_token_path
+        
+        _startup_state = StartupState(
+            missing_config=Config.validate(),
+            credentials_found=get_credentials_path().exists(),
+            token_found=get_token_path().exists(),
+        )
+    return _startup_state
+
+
+def check_configuration(state: StartupState) -> bool:
     """Check if the configuration is valid."""
-    missing = Config.validate()
+    missing = state.missing_config
     
     if missing:
         console.print(Panel(
@@ -116,12 +139,9 @@ def check_configuration() -> bool:
     return True
 
 
-def check_google_auth() -> bool:
+def check_google_auth(state: StartupState) -> bool:
     """Check Google OAuth setup."""
-    from src.config import get_credentials_path
-    
-    creds_path = get_credentials_path()
-    if not creds_path.exists():
+    if not state.credentials_found:
         console.print(Panel(
             "[warning]Google OAuth credentials not found.[/warning]\n\n"
             "To use Calendar and Gmail features, you need to set up OAuth:\n\n"
@@ -138,10 +158,8 @@ def check_google_auth() -> bool:
     return True
 
 
-def display_status():
+def display_status(state: StartupState):
     """Display current configuration status."""
-    from src.config import get_credentials_path, get_token_path
-    
     status_items = []
     
     # Check API key
@@ -151,13 +169,13 @@ def display_status():
         status_items.append("❌ Google API Key: Not configured")
     
     # Check OAuth credentials
-    if get_credentials_path().exists():
+    if state.credentials_found:
         status_items.append("✅ OAuth Credentials: Found")
     else:
         status_items.append("❌ OAuth Credentials: Not found")
     
     # Check OAuth token
-    if get_token_path().exists():
+    if state.token_found:
         status_items.append("✅ OAuth Token: Authenticated")
     else:
         status_items.append("⚠️ OAuth Token: Not authenticated (will prompt on first use)")
@@ -170,7 +188,8 @@ def display_status():
     
     # User info
     status_items.append(f"👤 User: {Config.USER_NAME} ({Config.USER_EMAIL})")
-    status_items.append(f"🤖 Model: {Config.MODEL_NAME}")
+    model = Config.GROQ_MODEL if Config.GROQ_API_KEY else Config.GEMINI_MODEL
+    status_items.append(f"🤖 Model: {model}")
     
     console.print(Panel(
         "\n".join(status_items),
@@ -179,82 +198,154 @@ def display_status():
     ))
 
 
+def _quit(assistant) -> bool:
+    """Exit the assistant."""
+    console.print("\n[info]Goodbye! 👋[/info]")
+    return True
+
+
+def _help(assistant) -> bool:
+    """Show the help message."""
+    display_help()
+    return False
+
+
+def _clear(assistant) -> bool:
+    """Clear conversation history."""
+    assistant.reset_conversation()
+    console.print("[info]Conversation cleared.[/info]\n")
+    return False
+
+
+def _status(assistant) -> bool:
+    """Show connection status."""
+    display_status(get_startup_state(refresh=True))
+    return False
+
+
+# REPL commands; each handler returns True when the loop should exit
+_COMMANDS = {
+    "quit": _quit,
+    "exit": _quit,
+    "q": _quit,
+    "help": _help,
+    "clear": _clear,
+    "status": _status,
+}
+
+
+def _warm_google_apis():
+    """Refresh OAuth credentials and open connections to the Google APIs."""
+    from src.tools.google_auth import get_cached_calendar_service, get_cached_gmail_service
+    
+    get_cached_calendar_service().events().list(calendarId="primary", maxResults=1).execute()
+    get_cached_gmail_service().users().getProfile(userId="me").execute()
+
+
+def _warmup():
+    """Warm up the Google API clients in the background while the user types."""
+    # Never start the interactive OAuth flow in the background
+    if not get_startup_state().token_found:
+        return
+    
+    try:
+        _warm_google_apis()
+    except Exception:
+        # The first real request will report any problem
+        pass
+
+
 def main():
     """Main entry point for the CLI."""
+    parser = argparse.ArgumentParser(description="Multi-agent personal assistant")
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="start a new conversation instead of resuming the previous one",
+    )
+    args = parser.parse_args()
+    
     console.print()
     display_welcome()
     
+    state = get_startup_state()
+    
     # Check configuration
-    if not check_configuration():
+    if not check_configuration(state):
         console.print("\n[error]Please configure the application before running.[/error]")
         console.print("Copy .env.example to .env and add your API keys.")
         return 1
     
     # Check Google OAuth (warning only)
-    check_google_auth()
+    check_google_auth(state)
     
     console.print()
     
     # Initialize the assistant
     try:
         console.print("[info]Initializing assistant...[/info]")
-        assistant = PersonalAssistant(name="Assistant")
+        
+        # Imported here so the welcome screen renders before the LLM stack loads
+        from src.agents.supervisor import PersonalAssistant
+        
+        assistant = PersonalAssistant(name="Assistant", fresh=args.fresh)
         console.print("[success]Assistant ready![/success]\n")
     except Exception as e:
         console.print(f"[error]Failed to initialize assistant: {e}[/error]")
         return 1
     
+    # Authenticate and connect while the user reads the welcome screen
+    # (a thread keeps the REPL synchronous, so Ctrl-C still interrupts a reply)
+    warmup_thread = threading.Thread(target=_warmup, daemon=True)
+    warmup_thread.start()
+    
     # Set up command history
     history_file = project_root / ".assistant_history"
-    history = FileHistory(str(history_file))
+    session = PromptSession(
+        history=FileHistory(str(history_file)),
+        auto_suggest=AutoSuggestFromHistory(),
+    )
     
     # Main conversation loop
     while True:
         try:
             # Get user input with history and auto-suggest
-            user_input = prompt(
-                "You: ",
-                history=history,
-                auto_suggest=AutoSuggestFromHistory(),
-            ).strip()
+            user_input = session.prompt("You: ").strip()
             
             if not user_input:
                 continue
             
             # Handle special commands
-            lower_input = user_input.lower()
-            
-            if lower_input in ["quit", "exit", "q"]:
-                console.print("\n[info]Goodbye! 👋[/info]")
-                break
-            
-            if lower_input == "help":
-                display_help()
+            handler = _COMMANDS.get(user_input.lower())
+            if handler is not None:
+                if handler(assistant):
+                    break
                 continue
             
-            if lower_input == "clear":
-                assistant.reset_conversation()
-                console.print("[info]Conversation cleared.[/info]\n")
-                continue
-            
-            if lower_input == "status":
-                display_status()
-                continue
+            if warmup_thread is not None:
+                warmup_thread.join()
+                warmup_thread = None
             
             # Stream the response
             console.print()
-            console.print("[assistant]Assistant:[/assistant]", end=" ")
+            console.print("[assistant]Assistant:[/assistant]")
             
             try:
-                response = assistant.chat(user_input)
-                
-                # Display response with markdown formatting
-                console.print()
-                console.print(Panel(
-                    Markdown(response),
-                    border_style="magenta",
-                    padding=(1, 2),
-                ))
+                # Show tokens as plain text while they arrive (Live redraws it
+                # at its own rate), then render the markdown once at the end
+                streamed = Text()
+                with Live(
+                    Panel(streamed, border_style="magenta", padding=(1, 2)),
+                    console=console,
+                    refresh_per_second=12,
+                ) as live:
+                    for token in assistant.stream(user_input):
+                        streamed.append(token)
+                    live.update(Panel(
+                        Markdown(streamed.plain),
+                        border_style="magenta",
+                        padding=(1, 2),
+                    ))
                 console.print()
                 
             except Exception as e:
@@ -0,0 +1,41 @@
+"""
+Fast JSON Parsing.
+
+Parses Google API responses (message lists, batch parts, email bodies) with
+orjson when it is installed. Only parsing is sped up: it yields the same
+Python objects as the stdlib, so nothing else in the process is affected.
+"""
+
+import json
+
+from googleapiclient.model import JsonModel
+
+try:
+    import orjson
+except ImportError:  # Optional dependency: pip install orjson
+    orjson = None
+
+
+def loads(s):
+    """Deserialize JSON with orjson, using the stdlib for input orjson rejects."""
+    if orjson is None:
+        return json.loads(s)
+    try:
+        return orjson.loads(s)
+    except orjson.JSONDecodeError:
+        # e.g. NaN/Infinity literals or big integers; the stdlib raises if truly invalid
+        return json.loads(s)
+
+
+class FastJsonModel(JsonModel):
+    """Google API client model that parses responses with `loads`."""
+
+    def deserialize(self, content):
+        try:
+            body = loads(content)
+        except ValueError:
+            # Let the stock model handle (or report) non-JSON bodies
+            return super().deserialize(content)
+        if self._data_wrapper and "data" in body:
+            body = body["data"]
+        return body
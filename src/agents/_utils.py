@@ -0,0 +1,42 @@
+"""
+Shared helpers for the agent modules.
+"""
+
+
+def flatten_content(content) -> str:
+    """
+    Convert a LangChain message content value to plain text.
+    
+    Args:
+        content: A string, or a list of content parts (as returned by Gemini).
+        
+    Returns:
+        The text content.
+    """
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        # Handle Gemini parts (list of dicts); non-text parts contribute nothing
+        return "".join(
+            part.get("text", "") if type(part) is dict else str(part)
+            for part in content
+        )
+    return str(content)
+
+
+def final_response_text(result: dict, default: str) -> str:
+    """
+    Extract the text of the final message from an agent result.
+    
+    Args:
+        result: State returned by `agent.invoke` / `agent.ainvoke`.
+        default: Text to return if the result has no messages.
+        
+    Returns:
+        The final message text.
+    """
+    messages = result.get("messages") if result else None
+    if not messages:
+        return default
+    final_message = messages[-1]
+    return flatten_content(getattr(final_message, "content", final_message))
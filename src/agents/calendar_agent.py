@@ -4,13 +4,15 @@ Calendar Agent Module.
 A specialized agent for handling calendar-related tasks using LangChain.
 """
 
-from datetime import datetime
-from zoneinfo import ZoneInfo
+import functools
+import threading
 from typing import Optional
 
-from langchain_core.tools import tool
+from langchain_core.tools import StructuredTool
 from langgraph.prebuilt import create_react_agent
 
+from src.agents._utils import final_response_text
+from src.cache import redis_cached
 from src.config import get_llm
 from src.tools.calendar_tools import (
     create_calendar_event,
@@ -19,6 +21,7 @@ from src.tools.calendar_tools import (
     list_upcoming_events,
     update_calendar_event,
 )
+from src.utils.time import get_current_datetime_str
 
 
 # Calendar Agent System Prompt
@@ -36,7 +39,7 @@ When parsing natural language dates and times:
 - "at 2pm" means 14:00:00
 - Always use ISO format for dates (YYYY-MM-DD) and times (HH:MM:SS)
 
-Current date and time: {current_datetime}
+The current date and time are given at the start of each request.
 Timezone: Asia/Kolkata (IST)
 
 Guidelines:
@@ -48,12 +51,24 @@ Guidelines:
 
 Be helpful, accurate, and always confirm what was scheduled in your final response."""
 
+# Per-request context prepended to the user's message
+_CTX_FMT = "Current datetime: {}\n\nUser request: {}".format
 
-def get_current_datetime_str() -> str:
-    """Get current datetime as a formatted string."""
-    tz = ZoneInfo("Asia/Kolkata")
-    now = datetime.now(tz)
-    return now.strftime("%A, %B %d, %Y at %I:%M %p %Z")
+
+CALENDAR_TOOLS = [
+    create_calendar_event,
+    get_available_time_slots,
+    list_upcoming_events,
+    delete_calendar_event,
+    update_calendar_event,
+]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_bound_llm():
+    """Get the calendar LLM with tool schemas bound (built once per process)."""
+    llm = get_llm(temperature=0.3)  # Lower temperature for more precise scheduling
+    return llm.bind_tools(CALENDAR_TOOLS)
 
 
 def create_calendar_agent():
@@ -63,44 +78,33 @@ def create_calendar_agent():
     Returns:
         A LangChain agent configured for calendar management.
     """
-    llm = get_llm(temperature=0.3)  # Lower temperature for more precise scheduling
-    
-    tools = [
-        create_calendar_event,
-        get_available_time_slots,
-        list_upcoming_events,
-        delete_calendar_event,
-        update_calendar_event,
-    ]
-    
-    # Format the prompt with current datetime
-    system_prompt = CALENDAR_AGENT_PROMPT.format(
-        current_datetime=get_current_datetime_str()
-    )
-    
+    # The current datetime is sent with each request, so the agent stays valid across days
     agent = create_react_agent(
-        model=llm,
-        tools=tools,
-        prompt=system_prompt,
+        model=_get_bound_llm(),
+        tools=CALENDAR_TOOLS,
+        prompt=CALENDAR_AGENT_PROMPT,
     )
     
     return agent
 
 
-# Cached agent instance
+# Cached agent instance (the lock keeps concurrent first calls from building twice)
 _calendar_agent = None
+_calendar_agent_lock = threading.Lock()
 
 
 def get_calendar_agent():
     """Get or create the calendar agent singleton."""
     global _calendar_agent
     if _calendar_agent is None:
-        _calendar_agent = create_calendar_agent()
+        with _calendar_agent_lock:
+            if _calendar_agent is None:
+                _calendar_agent = create_calendar_agent()
     return _calendar_agent
 
 
-@tool
-def calendar_agent_tool(request: str) -> str:
+@redis_cached(namespace="calendar", ttl=60)
+def _run_calendar_agent(request: str) -> str:
     """
     Schedule and manage calendar events using natural language.
 
@@ -123,24 +127,38 @@ def calendar_agent_tool(request: str) -> str:
     agent = get_calendar_agent()
     
     # Add current datetime context to the request
-    context = f"Current datetime: {get_current_datetime_str()}\n\nUser request: {request}"
+    context = _CTX_FMT(get_current_datetime_str(), request)
     
     try:
         result = agent.invoke({
             "messages": [{"role": "user", "content": context}]
         })
+        return final_response_text(result, "Calendar operation completed.")
         
-        # Extract the final message
-        if result and "messages" in result and result["messages"]:
-            final_message = result["messages"][-1]
-            content = final_message.content if hasattr(final_message, "content") else str(final_message)
-            
-            if isinstance(content, list):
-                # Handle Gemini parts (list of dicts)
-                return "".join([part.get("text", "") if isinstance(part, dict) else str(part) for part in content])
-            return str(content)
-        
-        return "Calendar operation completed."
+    except Exception as e:
+        return f"❌ Calendar agent error: {str(e)}"
+
+
+@redis_cached(namespace="calendar", ttl=60)
+async def _arun_calendar_agent(request: str) -> str:
+    """Async version of `_run_calendar_agent`."""
+    agent = get_calendar_agent()
+    
+    context = _CTX_FMT(get_current_datetime_str(), request)
+    
+    try:
+        result = await agent.ainvoke({
+            "messages": [{"role": "user", "content": context}]
+        })
+        return final_response_text(result, "Calendar operation completed.")
         
     except Exception as e:
         return f"❌ Calendar agent error: {str(e)}"
+
+
+# Sync and async implementations, so parallel supervisor tool calls overlap their I/O
+calendar_agent_tool = StructuredTool.from_function(
+    func=_run_calendar_agent,
+    coroutine=_arun_calendar_agent,
+    name="calendar_agent_tool",
+)
@@ -4,9 +4,14 @@ Email Agent Module.
 A specialized agent for handling email-related tasks using LangChain and Gmail.
 """
 
-from langchain_core.tools import tool
+import functools
+import threading
+
+from langchain_core.tools import StructuredTool
 from langgraph.prebuilt import create_react_agent
 
+from src.agents._utils import final_response_text
+from src.cache import redis_cached
 from src.config import get_llm, Config
 from src.tools.email_tools import (
     send_email,
@@ -48,6 +53,21 @@ Safety:
 Be helpful and always confirm what was sent in your final response."""
 
 
+EMAIL_TOOLS = [
+    send_email,
+    draft_email,
+    search_emails,
+    get_email_content,
+]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_bound_llm():
+    """Get the email LLM with tool schemas bound (built once per process)."""
+    llm = get_llm(temperature=0.5)  # Moderate temperature for natural writing
+    return llm.bind_tools(EMAIL_TOOLS)
+
+
 def create_email_agent():
     """
     Create an email agent with access to Gmail tools.
@@ -55,15 +75,6 @@ def create_email_agent():
     Returns:
         A LangChain agent configured for email management.
     """
-    llm = get_llm(temperature=0.5)  # Moderate temperature for natural writing
-    
-    tools = [
-        send_email,
-        draft_email,
-        search_emails,
-        get_email_content,
-    ]
-    
     # Format the prompt with user info
     system_prompt = EMAIL_AGENT_PROMPT.format(
         user_name=Config.USER_NAME,
@@ -71,28 +82,31 @@ def create_email_agent():
     )
     
     agent = create_react_agent(
-        model=llm,
-        tools=tools,
+        model=_get_bound_llm(),
+        tools=EMAIL_TOOLS,
         prompt=system_prompt,
     )
     
     return agent
 
 
-# Cached agent instance
+# Cached agent instance (the lock keeps concurrent first calls from building twice)
 _email_agent = None
+_email_agent_lock = threading.Lock()
 
 
 def get_email_agent():
     """Get or create the email agent singleton."""
     global _email_agent
     if _email_agent is None:
-        _email_agent = create_email_agent()
+        with _email_agent_lock:
+            if _email_agent is None:
+                _email_agent = create_email_agent()
     return _email_agent
 
 
-@tool
-def email_agent_tool(request: str) -> str:
+@redis_cached(namespace="email", ttl=600)
+def _run_email_agent(request: str) -> str:
     """
     Compose and send emails using natural language.
 
@@ -118,18 +132,30 @@ def email_agent_tool(request: str) -> str:
         result = agent.invoke({
             "messages": [{"role": "user", "content": request}]
         })
+        return final_response_text(result, "Email operation completed.")
         
-        # Extract the final message
-        if result and "messages" in result and result["messages"]:
-            final_message = result["messages"][-1]
-            content = final_message.content if hasattr(final_message, "content") else str(final_message)
-            
-            if isinstance(content, list):
-                # Handle Gemini parts (list of dicts)
-                return "".join([part.get("text", "") if isinstance(part, dict) else str(part) for part in content])
-            return str(content)
-        
-        return "Email operation completed."
+    except Exception as e:
+        return f"❌ Email agent error: {str(e)}"
+
+
+@redis_cached(namespace="email", ttl=600)
+async def _arun_email_agent(request: str) -> str:
+    """Async version of `_run_email_agent`."""
+    agent = get_email_agent()
+    
+    try:
+        result = await agent.ainvoke({
+            "messages": [{"role": "user", "content": request}]
+        })
+        return final_response_text(result, "Email operation completed.")
         
     except Exception as e:
         return f"❌ Email agent error: {str(e)}"
+
+
+# Sync and async implementations, so parallel supervisor tool calls overlap their I/O
+email_agent_tool = StructuredTool.from_function(
+    func=_run_email_agent,
+    coroutine=_arun_email_agent,
+    name="email_agent_tool",
+)
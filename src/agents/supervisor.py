@@ -5,16 +5,29 @@ The supervisor agent coordinates specialized sub-agents for comprehensive
 personal assistant functionality.
 """
 
+import asyncio
+import functools
+import re
+import sqlite3
+import uuid
 from datetime import datetime
-from zoneinfo import ZoneInfo
 from typing import Optional
 
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, trim_messages
 from langgraph.prebuilt import create_react_agent
 from langgraph.checkpoint.memory import MemorySaver
 
-from src.config import get_llm, Config
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+except ImportError:  # Optional dependency: pip install langgraph-checkpoint-sqlite
+    SqliteSaver = None
+
+from src.agents._utils import final_response_text, flatten_content
+from src.cache import create_semantic_cache, is_write_request, mentions_relative_date
+from src.config import get_state_db_path, get_streaming_llm, Config
 from src.agents.calendar_agent import calendar_agent_tool
 from src.agents.email_agent import email_agent_tool
+from src.utils.time import get_current_datetime_str
 
 
 # Supervisor System Prompt
@@ -24,8 +37,8 @@ You coordinate two specialized capabilities:
 1. **Calendar Management** (schedule_event): Schedule meetings, check availability, manage events
 2. **Email Communication** (manage_email): Send emails, create drafts, search inbox
 
-Current date and time: {current_datetime}
 User: {user_name} ({user_email})
+The current date and time are given at the start of each request.
 
 Your approach:
 1. Understand what the user needs
@@ -52,12 +65,67 @@ Examples of requests you can handle:
 
 Always be professional, friendly, and proactive in helping the user."""
 
+# Keyword rules for requests that clearly belong to a single sub-agent
+_CALENDAR_RE = re.compile(
+    r"\b(calendars?|meetings?|schedule|events?|appointments?|availability|free)\b",
+    re.IGNORECASE,
+)
+_EMAIL_RE = re.compile(
+    r"\b(e-?mails?|inbox|gmail|drafts?|reply|replies)\b|\bsend\b.*\bto\b.*@",
+    re.IGNORECASE,
+)
+
+# Multi-step requests and references to earlier turns need the supervisor
+_NEEDS_SUPERVISOR_RE = re.compile(r"\b(and|then|it|that|them|those)\b|,", re.IGNORECASE)
+
+# Per-request context prepended to the user's message
+_CTX_FMT = "Current datetime: {}\n\nUser request: {}".format
+
+# Most recent messages the supervisor sees from a persisted conversation
+_HISTORY_MAX_MESSAGES = 40
+
+
+@functools.lru_cache(maxsize=1)
+def _get_checkpointer():
+    """
+    Get the shared conversation checkpointer.
+    
+    Conversations are persisted to SQLite so they survive restarts,
+    falling back to in-memory storage if the SQLite saver is not installed.
+    """
+    if SqliteSaver is None:
+        return MemorySaver()
+    
+    conn = sqlite3.connect(str(get_state_db_path()), check_same_thread=False)
+    return SqliteSaver(conn)
+
+
+# Sub-agents wrapped as tools
+SUPERVISOR_TOOLS = [
+    calendar_agent_tool,
+    email_agent_tool,
+]
 
-def get_current_datetime_str() -> str:
-    """Get current datetime as a formatted string."""
-    tz = ZoneInfo("Asia/Kolkata")
-    now = datetime.now(tz)
-    return now.strftime("%A, %B %d, %Y at %I:%M %p %Z")
+
+def _trim_history(state: dict) -> dict:
+    """Pre-model hook that limits the conversation history sent to the LLM."""
+    messages = trim_messages(
+        state["messages"],
+        strategy="last",
+        token_counter=len,
+        max_tokens=_HISTORY_MAX_MESSAGES,
+        start_on="human",
+        include_system=True,
+    )
+    # Only the LLM input is trimmed; the checkpoint keeps the full history
+    return {"llm_input_messages": messages}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_bound_llm():
+    """Get the supervisor LLM with tool schemas bound (built once per process)."""
+    # The supervisor's tokens are what the CLI renders, so it always streams
+    return get_streaming_llm(temperature=0.7).bind_tools(SUPERVISOR_TOOLS)
 
 
 def create_supervisor_agent(with_memory: bool = True, assistant_name: str = "Assistant"):
@@ -71,35 +139,75 @@ def create_supervisor_agent(with_memory: bool = True, assistant_name: str = "Ass
     Returns:
         A LangChain supervisor agent.
     """
-    llm = get_llm(temperature=0.7)
-    
-    # Wrap sub-agents as tools
-    tools = [
-        calendar_agent_tool,
-        email_agent_tool,
-    ]
-    
-    # Format the system prompt
+    # Format the system prompt (the datetime is sent per request instead)
     system_prompt = SUPERVISOR_PROMPT.format(
         assistant_name=assistant_name,
-        current_datetime=get_current_datetime_str(),
         user_name=Config.USER_NAME,
         user_email=Config.USER_EMAIL,
     )
     
     # Create with optional memory
-    checkpointer = MemorySaver() if with_memory else None
+    checkpointer = _get_checkpointer() if with_memory else None
     
     agent = create_react_agent(
-        model=llm,
-        tools=tools,
+        model=_get_bound_llm(),
+        tools=SUPERVISOR_TOOLS,
         prompt=system_prompt,
         checkpointer=checkpointer,
+        pre_model_hook=_trim_history,
     )
     
     return agent
 
 
+@functools.lru_cache(maxsize=8)
+def _cached_supervisor(assistant_name: str, with_memory: bool):
+    """
+    Get a shared supervisor agent.
+    
+    One compiled graph can serve every session, since conversation
+    memory is scoped by the thread ID passed on each call.
+    """
+    return create_supervisor_agent(with_memory=with_memory, assistant_name=assistant_name)
+
+
+def _default_thread_id() -> str:
+    """Get the persistent conversation thread ID for the configured user."""
+    return f"user_{Config.USER_EMAIL}"
+
+
+def _new_thread_id() -> str:
+    """Generate a unique conversation thread ID."""
+    return f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+
+def _stream_text(events):
+    """
+    Yield the supervisor's text tokens from a `stream_mode="messages"` stream.
+    
+    Tool results and tokens from sub-agents running inside tools are skipped.
+    A complete AIMessage (e.g. an LLM cache hit, which is not streamed) is
+    yielded whole unless its tokens were already streamed.
+    """
+    streamed_ids = set()
+    for message, metadata in events:
+        if not isinstance(message, AIMessage):
+            continue
+        if metadata.get("langgraph_node") != "agent":
+            continue
+        if "|" in metadata.get("langgraph_checkpoint_ns", ""):
+            continue
+        
+        if isinstance(message, AIMessageChunk):
+            streamed_ids.add(message.id)
+        elif message.id in streamed_ids:
+            continue
+        
+        content = flatten_content(message.content)
+        if content:
+            yield content
+
+
 def run_supervisor(
     request: str,
     agent=None,
@@ -116,34 +224,87 @@ def run_supervisor(
         stream: Whether to stream the response.
         
     Returns:
-        The agent's response or a generator for streaming.
+        The agent's response, or a generator of (message chunk, metadata)
+        token events when streaming.
     """
     if agent is None:
-        agent = create_supervisor_agent()
+        agent = _cached_supervisor("Assistant", True)
     
     config = {"configurable": {"thread_id": thread_id}}
     
+    # Add current datetime context to the request
+    context = _CTX_FMT(get_current_datetime_str(), request)
+    
     if stream:
         return agent.stream(
-            {"messages": [{"role": "user", "content": request}]},
+            {"messages": [{"role": "user", "content": context}]},
             config,
+            stream_mode="messages",
         )
     else:
         result = agent.invoke(
-            {"messages": [{"role": "user", "content": request}]},
+            {"messages": [{"role": "user", "content": context}]},
             config,
         )
+        return final_response_text(result, "Request completed.")
+
+
+async def arun_supervisor(
+    request: str,
+    agent=None,
+    thread_id: str = "default",
+) -> str:
+    """
+    Run a request through the supervisor agent asynchronously.
+    
+    Sub-agent tools run concurrently when the supervisor calls
+    several of them in one step.
+    
+    Args:
+        request: User's natural language request.
+        agent: Optional pre-created agent instance.
+        thread_id: Thread ID for conversation memory.
         
-        if result and "messages" in result and result["messages"]:
-            final_message = result["messages"][-1]
-            content = final_message.content if hasattr(final_message, "content") else str(final_message)
-            
-            if isinstance(content, list):
-                # Handle Gemini parts (list of dicts)
-                return "".join([part.get("text", "") if isinstance(part, dict) else str(part) for part in content])
-            return str(content)
+    Returns:
+        The agent's response.
+    """
+    if agent is None:
+        agent = _cached_supervisor("Assistant", True)
+    
+    if SqliteSaver is not None and isinstance(agent.checkpointer, SqliteSaver):
+        # SqliteSaver has no async API; the sync graph still runs tool calls in parallel threads
+        return await asyncio.to_thread(run_supervisor, request, agent, thread_id)
+    
+    config = {"configurable": {"thread_id": thread_id}}
+    context = _CTX_FMT(get_current_datetime_str(), request)
+    
+    result = await agent.ainvoke(
+        {"messages": [{"role": "user", "content": context}]},
+        config,
+    )
+    return final_response_text(result, "Request completed.")
+
+
+def route_directly(request: str):
+    """
+    Pick the sub-agent tool for an unambiguous single-domain request.
+    
+    Args:
+        request: User's natural language request.
         
-        return "Request completed."
+    Returns:
+        The calendar or email agent tool, or None if the supervisor
+        should decide.
+    """
+    if _NEEDS_SUPERVISOR_RE.search(request):
+        return None
+    
+    is_calendar = _CALENDAR_RE.search(request) is not None
+    is_email = _EMAIL_RE.search(request) is not None
+    if is_calendar == is_email:
+        return None
+    
+    return calendar_agent_tool if is_calendar else email_agent_tool
 
 
 class PersonalAssistant:
@@ -156,27 +317,111 @@ class PersonalAssistant:
         print(response)
     """
     
-    def __init__(self, name: str = "Assistant"):
-        """Initialize the personal assistant."""
+    def __init__(self, name: str = "Assistant", fresh: bool = False):
+        """
+        Initialize the personal assistant.
+        
+        Args:
+            name: Name for the assistant.
+            fresh: Start a new conversation instead of resuming the user's last one.
+        """
         self.name = name
-        self.agent = create_supervisor_agent(with_memory=True, assistant_name=name)
-        self.thread_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.agent = _cached_supervisor(name, True)
+        self.thread_id = _new_thread_id() if fresh else _default_thread_id()
+        self._cache = create_semantic_cache()
     
     def chat(self, message: str) -> str:
         """
         Send a message to the assistant and get a response.
         
+        Read-only requests that closely match an earlier one are answered
+        from the semantic cache, and clearly single-domain requests go
+        straight to the matching sub-agent, skipping the supervisor's
+        routing call.
+        
         Args:
             message: User's message.
             
         Returns:
             Assistant's response.
         """
-        return run_supervisor(
-            request=message,
-            agent=self.agent,
-            thread_id=self.thread_id,
-            stream=False,
+        embedding, cached = self._cache_lookup(message)
+        if cached is not None:
+            self._remember(message, cached)
+            return cached
+        
+        tool = route_directly(message)
+        if tool is not None:
+            response = tool.invoke({"request": message})
+            self._remember(message, response)
+        else:
+            response = run_supervisor(
+                request=message,
+                agent=self.agent,
+                thread_id=self.thread_id,
+                stream=False,
+            )
+        self._cache_store(embedding, response)
+        return response
+    
+    async def achat(self, message: str) -> str:
+        """
+        Send a message to the assistant and get a response asynchronously.
+        
+        Args:
+            message: User's message.
+            
+        Returns:
+            Assistant's response.
+        """
+        embedding, cached = self._cache_lookup(message)
+        if cached is not None:
+            self._remember(message, cached)
+            return cached
+        
+        tool = route_directly(message)
+        if tool is not None:
+            response = await tool.ainvoke({"request": message})
+            self._remember(message, response)
+        else:
+            response = await arun_supervisor(
+                request=message,
+                agent=self.agent,
+                thread_id=self.thread_id,
+            )
+        self._cache_store(embedding, response)
+        return response
+    
+    def _cache_lookup(self, message: str):
+        """Look up a cached response; returns (embedding, response or None)."""
+        if self._cache is None:
+            return None, None
+        
+        if is_write_request(message):
+            # Writes can make any cached answer stale
+            self._cache.clear()
+            return None, None
+        
+        if mentions_relative_date(message):
+            # "today", "next week", ... resolve differently over time
+            return None, None
+        
+        return self._cache.lookup(message)
+    
+    def _cache_store(self, embedding, response: str):
+        """Cache a response for a looked-up message (errors and empty replies are not cached)."""
+        if embedding is not None and response.strip() and not response.startswith("❌"):
+            self._cache.store(embedding, response)
+    
+    def _remember(self, message: str, response: str):
+        """Add an exchange answered outside the supervisor to its conversation memory."""
+        if self.agent.checkpointer is None:
+            return
+        
+        self.agent.update_state(
+            {"configurable": {"thread_id": self.thread_id}},
+            {"messages": [HumanMessage(content=message), AIMessage(content=response)]},
+            as_node="agent",
         )
     
     def stream(self, message: str):
@@ -187,15 +432,40 @@ class PersonalAssistant:
             message: User's message.
             
         Yields:
-            Response chunks.
+            Response text as it is generated.
         """
-        return run_supervisor(
+        embedding, cached = self._cache_lookup(message)
+        if cached is not None:
+            self._remember(message, cached)
+            yield cached
+            return
+        
+        tool = route_directly(message)
+        if tool is not None:
+            response = tool.invoke({"request": message})
+            self._remember(message, response)
+            self._cache_store(embedding, response)
+            yield response
+            return
+        
+        parts = []
+        events = run_supervisor(
             request=message,
             agent=self.agent,
             thread_id=self.thread_id,
             stream=True,
         )
+        for text in _stream_text(events):
+            parts.append(text)
+            yield text
+        
+        self._cache_store(embedding, "".join(parts))
     
     def reset_conversation(self):
-        """Start a new conversation thread."""
-        self.thread_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        """Clear the conversation history, including its saved checkpoints."""
+        checkpointer = self.agent.checkpointer
+        if checkpointer is not None and hasattr(checkpointer, "delete_thread"):
+            # Deleting the checkpoints keeps the reset across restarts
+            checkpointer.delete_thread(self.thread_id)
+        else:
+            self.thread_id = _new_thread_id()
@@ -0,0 +1,319 @@
+"""
+Response Caching Module.
+
+Caches that let repeated or paraphrased read-only requests skip the
+LLM-backed agents entirely.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import re
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+try:
+    import redis
+except ImportError:  # Optional dependency: pip install redis
+    redis = None
+
+from src.config import Config
+
+
+# Requests that change calendar or mailbox state must always reach the agents
+_WRITE_RE = re.compile(
+    r"\b(send|schedul|creat|delet|draft|updat|cancel|book|repl|forward)\w*",
+    re.IGNORECASE,
+)
+
+
+_READ_RE = re.compile(r"\b(what|list|search|check|find|show)\b", re.IGNORECASE)
+
+
+def is_write_request(request: str) -> bool:
+    """Check whether a request may have side effects and must not be cached."""
+    return _WRITE_RE.search(request) is not None
+
+
+def is_read_request(request: str) -> bool:
+    """Check whether a request is clearly read-only and safe to cache."""
+    return _READ_RE.search(request) is not None and not is_write_request(request)
+
+
+# Requests whose answer depends on when they are asked
+_RELATIVE_DATE_RE = re.compile(
+    r"\b(now|today|tonight|tomorrow|yesterday|this|next|last|upcoming|recent|recently|latest"
+    r"|ago|monday|tuesday|wednesday|thursday|friday|saturday|sunday|weekend)\b",
+    re.IGNORECASE,
+)
+
+
+def mentions_relative_date(request: str) -> bool:
+    """Check whether a request refers to dates relative to the current time."""
+    return _RELATIVE_DATE_RE.search(request) is not None
+
+
+class SemanticCache:
+    """
+    In-process cache of responses keyed by message embeddings.
+
+    A lookup embeds the message and compares it (cosine similarity) against
+    every cached embedding in a single matrix-vector product. Entries older
+    than the TTL never match, and when the cache is full the least recently
+    used entry is overwritten.
+
+    Example:
+        cache = SemanticCache()
+        embedding, response = cache.lookup("What's on my calendar today?")
+        if response is None:
+            response = expensive_call()
+            cache.store(embedding, response)
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.87,
+        max_entries: int = 512,
+        model_name: str = "all-MiniLM-L6-v2",
+        ttl: float = 300.0,
+    ):
+        """
+        Initialize the cache and load the embedding model.
+
+        Args:
+            threshold: Minimum cosine similarity for a cache hit.
+            max_entries: Maximum number of cached responses.
+            model_name: SentenceTransformer model used for embeddings.
+            ttl: Seconds a cached response stays valid.
+        """
+        # Heavy imports (torch, transformers) are paid only when a cache is built
+        import numpy as np
+        from sentence_transformers import SentenceTransformer
+
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._model = SentenceTransformer(model_name)
+
+        dim = self._model.get_sentence_embedding_dimension()
+        self._matrix = np.zeros((max_entries, dim), dtype=np.float32)
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._stored_at = np.zeros(max_entries, dtype=np.float64)
+        self._responses: list[Optional[str]] = [None] * max_entries
+        self._size = 0
+        self._tick = 0
+
+    def lookup(self, message: str) -> tuple["np.ndarray", Optional[str]]:
+        """
+        Look up a cached response for a message.
+
+        Args:
+            message: User's message.
+
+        Returns:
+            Tuple of (embedding, cached response or None). Pass the embedding
+            to `store` on a miss to avoid encoding the message twice.
+        """
+        embedding = self._model.encode([message], normalize_embeddings=True)[0]
+        self._tick += 1
+
+        if self._size:
+            sims = self._matrix[: self._size] @ embedding
+            # Expired entries can never be a hit
+            sims[self._stored_at[: self._size] < time.monotonic() - self.ttl] = -1.0
+            best = int(sims.argmax())
+            if sims[best] >= self.threshold:
+                self._last_used[best] = self._tick
+                return embedding, self._responses[best]
+
+        return embedding, None
+
+    def store(self, embedding: "np.ndarray", response: str):
+        """Cache a response, evicting the least recently used entry if full."""
+        if self._size < self.max_entries:
+            slot = self._size
+            self._size += 1
+        else:
+            slot = int(self._last_used.argmin())
+
+        self._matrix[slot] = embedding
+        self._responses[slot] = response
+        self._last_used[slot] = self._tick
+        self._stored_at[slot] = time.monotonic()
+
+    def clear(self):
+        """Remove all cached responses."""
+        self._responses = [None] * self.max_entries
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+
+def create_semantic_cache() -> Optional[SemanticCache]:
+    """
+    Create a semantic cache if enabled and its dependencies are installed.
+
+    Returns:
+        A SemanticCache, or None if caching is unavailable (including when
+        the embedding model cannot be loaded, e.g. offline on first use).
+    """
+    if not Config.SEMANTIC_CACHE_ENABLED:
+        return None
+    try:
+        return SemanticCache(
+            threshold=Config.SEMANTIC_CACHE_THRESHOLD,
+            ttl=Config.SEMANTIC_CACHE_TTL,
+        )
+    except ImportError:  # Optional dependency: pip install numpy sentence-transformers
+        return None
+    except Exception:
+        # The assistant works without the cache; never fail startup over it
+        return None
+
+
+# Lazily created Redis client
+_redis_client = None
+
+# Seconds to skip Redis after it could not be reached, so an outage does
+# not add a socket timeout to every tool call
+_REDIS_RETRY_AFTER = 30.0
+_redis_down_until = 0.0
+
+
+def get_redis_client():
+    """Get the shared Redis client, or None if Redis is not configured or down."""
+    global _redis_client
+    if time.monotonic() < _redis_down_until:
+        return None
+    if _redis_client is None and redis is not None and Config.REDIS_URL:
+        _redis_client = redis.Redis.from_url(
+            Config.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+    return _redis_client
+
+
+def _redis_failed(error: Exception):
+    """Stop using Redis for a while if an error means it is unreachable."""
+    global _redis_down_until
+    if isinstance(error, (redis.ConnectionError, redis.TimeoutError)):
+        _redis_down_until = time.monotonic() + _REDIS_RETRY_AFTER
+
+
+@functools.lru_cache(maxsize=None)
+def _user_scope(user_email: str) -> str:
+    """Get the key prefix that keeps one user's cached results apart from another's."""
+    return hashlib.sha256(user_email.lower().encode("utf-8")).hexdigest()[:16]
+
+
+def _generation_key(namespace: str) -> str:
+    """Get the key of the counter that is bumped to invalidate a namespace."""
+    return f"{namespace}:{_user_scope(Config.USER_EMAIL)}:generation"
+
+
+def invalidate_redis_cache(namespace: str):
+    """
+    Make every cached result in a namespace stale for the current user.
+
+    Entries are keyed by a generation counter, so bumping it is enough;
+    the old entries simply expire.
+    """
+    client = get_redis_client()
+    if client is None:
+        return
+    try:
+        client.incr(_generation_key(namespace))
+    except redis.RedisError as e:
+        _redis_failed(e)
+
+
+def _redis_lookup(namespace: str, request: str) -> tuple[Optional[str], Optional[str]]:
+    """
+    Look up a cached tool result.
+
+    Returns:
+        Tuple of (cache key, cached result). The key is None when the
+        request must not be cached or Redis is unavailable.
+    """
+    client = get_redis_client()
+    if client is None or not is_read_request(request):
+        return None, None
+
+    digest = hashlib.sha256(request.lower().strip().encode("utf-8")).hexdigest()
+
+    try:
+        generation = client.get(_generation_key(namespace)) or b"0"
+        key = f"{namespace}:{_user_scope(Config.USER_EMAIL)}:{generation.decode()}:{digest}"
+        cached = client.get(key)
+    except redis.RedisError as e:
+        _redis_failed(e)
+        return None, None
+
+    return key, cached.decode("utf-8") if cached is not None else None
+
+
+def _redis_store(namespace: str, request: str, key: Optional[str], ttl: int, result: str):
+    """Cache a read result, or invalidate the namespace after a write request."""
+    if is_write_request(request):
+        invalidate_redis_cache(namespace)
+        return
+    client = get_redis_client()
+    if client is None or key is None or result.startswith("❌"):
+        return
+    try:
+        client.setex(key, ttl, result)
+    except redis.RedisError as e:
+        _redis_failed(e)
+
+
+def redis_cached(namespace: str, ttl: int = 300) -> Callable:
+    """
+    Cache a sub-agent tool's results in Redis.
+
+    Only read-only requests are cached, keyed by the user and a hash of the
+    normalized request. Write requests invalidate the namespace. Error
+    results are never cached, and if Redis is unreachable the wrapped
+    function is called directly (and Redis is skipped for a while). Works
+    for both sync and async functions; the async wrapper does its Redis
+    I/O in a worker thread so it never blocks the event loop.
+
+    Args:
+        namespace: Key prefix for this tool's entries.
+        ttl: Time-to-live for cached results, in seconds.
+
+    Returns:
+        A decorator for functions taking a single `request` string.
+    """
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(request: str) -> str:
+                if get_redis_client() is None:
+                    return await func(request)
+                key, cached = await asyncio.to_thread(_redis_lookup, namespace, request)
+                if cached is not None:
+                    return cached
+                result = await func(request)
+                await asyncio.to_thread(_redis_store, namespace, request, key, ttl, result)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(request: str) -> str:
+            key, cached = _redis_lookup(namespace, request)
+            if cached is not None:
+                return cached
+            result = func(request)
+            _redis_store(namespace, request, key, ttl, result)
+            return result
+
+        return wrapper
+
+    return decorator
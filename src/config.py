@@ -5,58 +5,200 @@ Handles environment variables, LLM initialization, and Google API setup.
 """
 
 import os
+from functools import cached_property
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from dotenv import load_dotenv
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_groq import ChatGroq
-from langchain_core.language_models.chat_models import BaseChatModel
+if TYPE_CHECKING:
+    from langchain_core.language_models.chat_models import BaseChatModel
 
 
-# Load environment variables from .env file
+# Load environment variables from .env file. The sentinel is inherited by
+# subprocesses and forked workers, whose environment already has the values.
 env_path = Path(__file__).parent.parent / ".env"
-load_dotenv(env_path)
+if not os.getenv("_CONFIG_LOADED"):
+    from dotenv import load_dotenv
+    
+    load_dotenv(env_path)
+    os.environ["_CONFIG_LOADED"] = "1"
+
+
+def _env_flag(name: str, default: str) -> bool:
+    """Read a true/false environment variable."""
+    return os.getenv(name, default).lower() == "true"
 
 
-class Config:
-    """Application configuration loaded from environment variables."""
+class _Config:
+    """
+    Application configuration loaded from environment variables.
+    
+    Each value is read from the environment the first time it is accessed
+    and then kept for the life of the process.
+    """
     
     # Google Gemini API
-    GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
+    @cached_property
+    def GOOGLE_API_KEY(self) -> str:
+        return os.getenv("GOOGLE_API_KEY", "")
     
     # Groq API
-    GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
+    @cached_property
+    def GROQ_API_KEY(self) -> str:
+        return os.getenv("GROQ_API_KEY", "")
     
     # LangSmith Tracing
-    LANGSMITH_TRACING: bool = os.getenv("LANGSMITH_TRACING", "false").lower() == "true"
-    LANGSMITH_API_KEY: str = os.getenv("LANGSMITH_API_KEY", "")
+    @cached_property
+    def LANGSMITH_TRACING(self) -> bool:
+        return _env_flag("LANGSMITH_TRACING", "false")
+    
+    @cached_property
+    def LANGSMITH_API_KEY(self) -> str:
+        return os.getenv("LANGSMITH_API_KEY", "")
     
     # User Information
-    USER_EMAIL: str = os.getenv("USER_EMAIL", "user@example.com")
-    USER_NAME: str = os.getenv("USER_NAME", "User")
+    @cached_property
+    def USER_EMAIL(self) -> str:
+        return os.getenv("USER_EMAIL", "user@example.com")
+    
+    @cached_property
+    def USER_NAME(self) -> str:
+        return os.getenv("USER_NAME", "User")
     
     # Model Configuration
     # Gemini defaults
-    GEMINI_MODEL: str = os.getenv("MODEL_NAME", "gemini-2.0-flash-exp")
+    @cached_property
+    def GEMINI_MODEL(self) -> str:
+        return os.getenv("MODEL_NAME", "gemini-2.0-flash-exp")
+    
     # Groq defaults
-    GROQ_MODEL: str = os.getenv("GROQ_MODEL_NAME", "llama-3.3-70b-versatile")
+    @cached_property
+    def GROQ_MODEL(self) -> str:
+        return os.getenv("GROQ_MODEL_NAME", "llama-3.3-70b-versatile")
+    
+    @cached_property
+    def MODEL_TEMPERATURE(self) -> float:
+        return float(os.getenv("MODEL_TEMPERATURE", "0.7"))
     
-    MODEL_TEMPERATURE: float = float(os.getenv("MODEL_TEMPERATURE", "0.7"))
+    # Response Caching
+    @cached_property
+    def SEMANTIC_CACHE_ENABLED(self) -> bool:
+        return _env_flag("SEMANTIC_CACHE", "true")
     
-    @classmethod
-    def validate(cls) -> list[str]:
+    @cached_property
+    def SEMANTIC_CACHE_THRESHOLD(self) -> float:
+        return float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.87"))
+    
+    @cached_property
+    def SEMANTIC_CACHE_TTL(self) -> float:
+        return float(os.getenv("SEMANTIC_CACHE_TTL", "300"))
+    
+    @cached_property
+    def REDIS_URL(self) -> str:
+        return os.getenv("REDIS_URL", "")
+    
+    @cached_property
+    def LLM_CACHE_ENABLED(self) -> bool:
+        # Off by default: the cache stores prompts and responses on disk
+        return _env_flag("LLM_CACHE", "false")
+    
+    def validate(self) -> list[str]:
         """Validate required configuration. Returns list of missing items."""
         missing = []
-        if not cls.GOOGLE_API_KEY:
+        if not self.GOOGLE_API_KEY:
             missing.append("GOOGLE_API_KEY")
         return missing
 
 
-def get_llm(temperature: Optional[float] = None) -> BaseChatModel:
+Config = _Config()
+
+
+# Configure LangSmith tracing if enabled (once, at import)
+if Config.LANGSMITH_TRACING:
+    os.environ["LANGSMITH_TRACING"] = "true"
+    if Config.LANGSMITH_API_KEY:
+        os.environ["LANGSMITH_API_KEY"] = Config.LANGSMITH_API_KEY
+
+
+# LLM instances keyed by (provider, model, temperature, streaming)
+_llm_cache: dict[tuple[str, str, float, bool], "BaseChatModel"] = {}
+
+
+# Whether the global LLM response cache has been configured
+_response_cache_installed = False
+
+
+def _install_response_cache():
+    """
+    Cache LLM responses in SQLite so identical prompts skip the API call.
+    
+    Runs once, before the first model is created. Does nothing when
+    LLM_CACHE is disabled or langchain-community is not installed.
+    """
+    global _response_cache_installed
+    if _response_cache_installed:
+        return
+    _response_cache_installed = True
+    
+    if not Config.LLM_CACHE_ENABLED:
+        return
+    
+    try:
+        from langchain_community.cache import SQLiteCache
+    except ImportError:  # Optional dependency: pip install langchain-community
+        return
+    
+    from langchain_core.globals import set_llm_cache
+    
+    set_llm_cache(SQLiteCache(database_path=str(get_llm_cache_path())))
+
+
+def _build_llm(temperature: Optional[float], streaming: bool) -> "BaseChatModel":
+    """Create or reuse the configured chat model. Prefers Groq if GROQ_API_KEY is present."""
+    _install_response_cache()
+    
+    temp = float(temperature if temperature is not None else Config.MODEL_TEMPERATURE)
+
+    # Prefer Groq if key is present
+    if Config.GROQ_API_KEY:
+        key = ("groq", Config.GROQ_MODEL, temp, streaming)
+        if key not in _llm_cache:
+            # Provider SDKs are imported only when used; they are slow to load
+            from langchain_groq import ChatGroq
+            
+            _llm_cache[key] = ChatGroq(
+                model=Config.GROQ_MODEL,
+                temperature=temp,
+                groq_api_key=Config.GROQ_API_KEY,
+                streaming=streaming,
+            )
+        return _llm_cache[key]
+        
+    if not Config.GOOGLE_API_KEY:
+        raise ValueError(
+            "Neither GROQ_API_KEY nor GOOGLE_API_KEY is configured. "
+            "Please set at least one in your .env file."
+        )
+    
+    key = ("gemini", Config.GEMINI_MODEL, temp, streaming)
+    if key not in _llm_cache:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        
+        _llm_cache[key] = ChatGoogleGenerativeAI(
+            model=Config.GEMINI_MODEL,
+            temperature=temp,
+            google_api_key=Config.GOOGLE_API_KEY,
+            streaming=streaming,
+        )
+    return _llm_cache[key]
+
+
+def get_llm(temperature: Optional[float] = None) -> "BaseChatModel":
     """
     Get the configured LLM instance. Prefers Groq if GROQ_API_KEY is present.
     
+    Instances are cached, so callers asking for the same temperature share
+    one client and its HTTP connection pool.
+    
     Args:
         temperature: Override the default temperature setting.
         
@@ -66,33 +208,26 @@ def get_llm(temperature: Optional[float] = None) -> BaseChatModel:
     Raises:
         ValueError: If no API key is configured.
     """
-    # Configure LangSmith tracing if enabled
-    if Config.LANGSMITH_TRACING:
-        os.environ["LANGSMITH_TRACING"] = "true"
-        if Config.LANGSMITH_API_KEY:
-            os.environ["LANGSMITH_API_KEY"] = Config.LANGSMITH_API_KEY
-            
-    temp = temperature if temperature is not None else Config.MODEL_TEMPERATURE
+    return _build_llm(temperature, streaming=False)
 
-    # Prefer Groq if key is present
-    if Config.GROQ_API_KEY:
-        return ChatGroq(
-            model=Config.GROQ_MODEL,
-            temperature=temp,
-            groq_api_key=Config.GROQ_API_KEY,
-        )
-        
-    if not Config.GOOGLE_API_KEY:
-        raise ValueError(
-            "Neither GROQ_API_KEY nor GOOGLE_API_KEY is configured. "
-            "Please set at least one in your .env file."
-        )
+
+def get_streaming_llm(temperature: Optional[float] = None) -> "BaseChatModel":
+    """
+    Get the configured LLM instance with token streaming enabled.
+    
+    Even a plain invoke() then streams from the provider, so token callbacks
+    (and LangGraph's "messages" stream mode) see output as it is generated.
     
-    return ChatGoogleGenerativeAI(
-        model=Config.GEMINI_MODEL,
-        temperature=temp,
-        google_api_key=Config.GOOGLE_API_KEY,
-    )
+    Args:
+        temperature: Override the default temperature setting.
+        
+    Returns:
+        Configured streaming Chat model instance (Groq or Gemini).
+        
+    Raises:
+        ValueError: If no API key is configured.
+    """
+    return _build_llm(temperature, streaming=True)
 
 
 # Google API Scopes
@@ -112,3 +247,21 @@ def get_credentials_path() -> Path:
 def get_token_path() -> Path:
     """Get the path to store OAuth tokens."""
     return Path(__file__).parent.parent / "token.json"
+
+
+def _get_state_dir() -> Path:
+    """Get the per-user directory for local state, outside the repository."""
+    base = os.getenv("XDG_STATE_HOME") or Path.home() / ".local" / "state"
+    state_dir = Path(base) / "personal-assistant"
+    state_dir.mkdir(parents=True, exist_ok=True)
+    return state_dir
+
+
+def get_state_db_path() -> Path:
+    """Get the path to the conversation state database."""
+    return _get_state_dir() / "assistant_state.sqlite"
+
+
+def get_llm_cache_path() -> Path:
+    """Get the path to the LLM response cache database."""
+    return _get_state_dir() / "langchain_cache.db"
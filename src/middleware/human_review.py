@@ -5,12 +5,19 @@ Provides functionality to pause execution for human review of sensitive actions
 like sending emails or creating calendar events.
 """
 
+import itertools
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Callable, Optional
 from datetime import datetime
 
 
+# Fixed parts of the review text
+_SEP = "=" * 50
+_HEADER = f"📋 Pending Action Review\n{_SEP}\n"
+
+
 class ReviewDecision(Enum):
     """Possible decisions for a pending review."""
     PENDING = "pending"
@@ -19,7 +26,7 @@ class ReviewDecision(Enum):
     EDITED = "edited"
 
 
-@dataclass
+@dataclass(slots=True)
 class PendingAction:
     """Represents an action pending human review."""
     id: str
@@ -31,6 +38,11 @@ class PendingAction:
     decision: ReviewDecision = ReviewDecision.PENDING
     edited_arguments: Optional[dict] = None
     rejection_reason: Optional[str] = None
+    _created_at_iso: str = field(init=False, repr=False, compare=False)
+    _review_text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._created_at_iso = self.created_at.isoformat()
     
     def to_display_dict(self) -> dict:
         """Convert to a dictionary for display purposes."""
@@ -40,20 +52,18 @@ class PendingAction:
             "tool": self.tool_name,
             "arguments": self.arguments,
             "description": self.description,
-            "created_at": self.created_at.isoformat(),
+            "created_at": self._created_at_iso,
             "status": self.decision.value,
         }
     
     def format_for_review(self) -> str:
-        """Format the action for human review."""
-        lines = [
-            f"📋 Pending Action Review",
-            f"{'='*50}",
-            f"ID: {self.id}",
-            f"Type: {self.action_type.title()}",
-            f"Tool: {self.tool_name}",
-            f"",
-            f"Arguments:",
+        """Format the action for human review. The text is built once and reused."""
+        if self._review_text is not None:
+            return self._review_text
+        
+        parts = [
+            _HEADER,
+            f"ID: {self.id}\nType: {self.action_type.title()}\nTool: {self.tool_name}\n\nArguments:\n",
         ]
         
         for key, value in self.arguments.items():
@@ -66,15 +76,12 @@ class PendingAction:
             if len(value_str) > 100:
                 value_str = value_str[:97] + "..."
                 
-            lines.append(f"  • {key}: {value_str}")
+            parts.append(f"  • {key}: {value_str}\n")
         
-        lines.extend([
-            "",
-            f"Description: {self.description}",
-            f"{'='*50}",
-        ])
+        parts.append(f"\nDescription: {self.description}\n{_SEP}")
         
-        return "\n".join(lines)
+        self._review_text = "".join(parts)
+        return self._review_text
 
 
 class HumanReviewMiddleware:
@@ -99,11 +106,22 @@ class HumanReviewMiddleware:
             middleware.approve(action.id)
     """
     
-    def __init__(self):
-        """Initialize the middleware."""
+    def __init__(self, max_history: int = 1024):
+        """
+        Initialize the middleware.
+        
+        Args:
+            max_history: Number of actions to keep before the oldest completed
+                ones are discarded. Pending actions are never discarded.
+        """
+        self.max_history = max_history
         self._registered_tools: dict[str, dict] = {}
         self._pending_actions: dict[str, PendingAction] = {}
-        self._action_counter = 0
+        # IDs of actions still awaiting review, in creation order
+        self._pending_ids: dict[str, None] = {}
+        # IDs of reviewed actions, oldest decision first
+        self._completed_ids: OrderedDict[str, None] = OrderedDict()
+        self._action_ids = itertools.count(1)
     
     def register_tool(
         self,
@@ -145,8 +163,7 @@ class HumanReviewMiddleware:
         Returns:
             PendingAction object.
         """
-        self._action_counter += 1
-        action_id = f"action_{self._action_counter}"
+        action_id = f"action_{next(self._action_ids)}"
         
         tool_info = self._registered_tools.get(tool_name, {})
         action_type = tool_info.get("action_type", "unknown")
@@ -166,14 +183,31 @@ class HumanReviewMiddleware:
         )
         
         self._pending_actions[action_id] = action
+        self._pending_ids[action_id] = None
+        self._trim_history()
         return action
     
+    def _trim_history(self):
+        """Discard the oldest completed actions while over max_history."""
+        actions = self._pending_actions
+        completed = self._completed_ids
+        while len(actions) > self.max_history and completed:
+            action_id, _ = completed.popitem(last=False)
+            del actions[action_id]
+    
+    def _complete(self, action_id: str) -> Optional[PendingAction]:
+        """Move an action out of the pending index, or return None if not pending."""
+        if action_id not in self._pending_ids:
+            return None
+        
+        del self._pending_ids[action_id]
+        self._completed_ids[action_id] = None
+        return self._pending_actions[action_id]
+    
     def get_pending_actions(self) -> list[PendingAction]:
         """Get all pending actions."""
-        return [
-            action for action in self._pending_actions.values()
-            if action.decision == ReviewDecision.PENDING
-        ]
+        actions = self._pending_actions
+        return [actions[action_id] for action_id in self._pending_ids]
     
     def get_action(self, action_id: str) -> Optional[PendingAction]:
         """Get a specific action by ID."""
@@ -189,11 +223,12 @@ class HumanReviewMiddleware:
         Returns:
             True if approved successfully.
         """
-        action = self._pending_actions.get(action_id)
-        if action and action.decision == ReviewDecision.PENDING:
-            action.decision = ReviewDecision.APPROVED
-            return True
-        return False
+        action = self._complete(action_id)
+        if action is None:
+            return False
+        
+        action.decision = ReviewDecision.APPROVED
+        return True
     
     def reject(self, action_id: str, reason: str = "") -> bool:
         """
@@ -206,12 +241,13 @@ class HumanReviewMiddleware:
         Returns:
             True if rejected successfully.
         """
-        action = self._pending_actions.get(action_id)
-        if action and action.decision == ReviewDecision.PENDING:
-            action.decision = ReviewDecision.REJECTED
-            action.rejection_reason = reason
-            return True
-        return False
+        action = self._complete(action_id)
+        if action is None:
+            return False
+        
+        action.decision = ReviewDecision.REJECTED
+        action.rejection_reason = reason
+        return True
     
     def edit(self, action_id: str, edited_arguments: dict) -> bool:
         """
@@ -224,12 +260,13 @@ class HumanReviewMiddleware:
         Returns:
             True if edited successfully.
         """
-        action = self._pending_actions.get(action_id)
-        if action and action.decision == ReviewDecision.PENDING:
-            action.decision = ReviewDecision.EDITED
-            action.edited_arguments = edited_arguments
-            return True
-        return False
+        action = self._complete(action_id)
+        if action is None:
+            return False
+        
+        action.decision = ReviewDecision.EDITED
+        action.edited_arguments = edited_arguments
+        return True
     
     def get_final_arguments(self, action_id: str) -> Optional[dict]:
         """
@@ -255,11 +292,9 @@ class HumanReviewMiddleware:
     
     def clear_completed(self):
         """Remove all completed (non-pending) actions."""
-        self._pending_actions = {
-            action_id: action
-            for action_id, action in self._pending_actions.items()
-            if action.decision == ReviewDecision.PENDING
-        }
+        actions = self._pending_actions
+        self._pending_actions = {action_id: actions[action_id] for action_id in self._pending_ids}
+        self._completed_ids.clear()
 
 
 # Global middleware instance
@@ -4,19 +4,77 @@ Google Calendar Tools.
 LangChain tools for interacting with Google Calendar API.
 """
 
+import asyncio
+import functools
 from datetime import datetime, timedelta
 from typing import Optional
 from zoneinfo import ZoneInfo
 
-from langchain_core.tools import tool
+from googleapiclient.errors import HttpError
+from langchain_core.tools import StructuredTool, tool
 
+from src.cache import invalidate_redis_cache
 from src.tools.google_auth import get_cached_calendar_service
+from src.utils.time import LOCAL_TIMEZONE, LOCAL_TIMEZONE_NAME
+
+
+# HTTP statuses the Calendar API returns for missing or already-deleted events
+_NOT_FOUND_STATUSES = (404, 410)
+
+# Names used when formatting event times (matches strftime's %a and %b)
+_WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# Time zone field shared by every event start/end we send
+_TZ_FIELD = {"timeZone": LOCAL_TIMEZONE_NAME}
+
+
+def _threaded(sync_tool: StructuredTool) -> StructuredTool:
+    """
+    Give a blocking tool an async entry point that runs it in a worker thread.
+    
+    When the agent is invoked asynchronously, independent tool calls from one
+    model turn then overlap their Google API round-trips.
+    """
+    func = sync_tool.func
+    
+    async def coroutine(*args, **kwargs) -> str:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    
+    sync_tool.coroutine = coroutine
+    return sync_tool
+
+
+def _format_event_start(dt: datetime) -> str:
+    """Format a start time like "Mon, Jan 15 at 02:00 PM" without strftime."""
+    hour = dt.hour % 12 or 12
+    meridiem = "AM" if dt.hour < 12 else "PM"
+    return (
+        f"{_WEEKDAYS[dt.weekday()]}, {_MONTHS[dt.month - 1]} {dt.day:02d} "
+        f"at {hour:02d}:{dt.minute:02d} {meridiem}"
+    )
 
 
 def get_local_timezone() -> ZoneInfo:
     """Get the local timezone."""
-    # Default to IST for India, adjust as needed
-    return ZoneInfo("Asia/Kolkata")
+    return LOCAL_TIMEZONE
+
+
+# strptime formats keyed by (date/time separator, number of colons)
+_DATETIME_FORMATS = {
+    ("T", 2): "%Y-%m-%dT%H:%M:%S",
+    (" ", 2): "%Y-%m-%d %H:%M:%S",
+    (" ", 1): "%Y-%m-%d %H:%M",
+    ("T", 1): "%Y-%m-%dT%H:%M",
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_time_of_day(time_str: str) -> tuple[int, int, int]:
+    """Split an "HH[:MM[:SS]]" string into (hour, minute, second)."""
+    parts = [int(part) for part in time_str.split(":")[:3]]
+    parts.extend([0] * (3 - len(parts)))
+    return tuple(parts)
 
 
 def parse_datetime_to_iso(dt_str: str, default_time: str = "09:00:00") -> str:
@@ -30,43 +88,48 @@ def parse_datetime_to_iso(dt_str: str, default_time: str = "09:00:00") -> str:
     Returns:
         ISO formatted datetime string.
     """
-    tz = get_local_timezone()
-    
-    # Try different formats
-    formats = [
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d %H:%M",
-        "%Y-%m-%dT%H:%M",
-        "%Y-%m-%d",
-    ]
-    
-    for fmt in formats:
+    # Fast path: ISO datetimes, which the tool docstrings ask the LLM for
+    if len(dt_str) >= 16 and dt_str[10] in "T ":
         try:
-            dt = datetime.strptime(dt_str, fmt)
-            if fmt == "%Y-%m-%d":
-                # Only date provided, add default time
-                time_parts = default_time.split(":")
-                dt = dt.replace(
-                    hour=int(time_parts[0]),
-                    minute=int(time_parts[1]) if len(time_parts) > 1 else 0,
-                    second=int(time_parts[2]) if len(time_parts) > 2 else 0,
-                )
-            dt = dt.replace(tzinfo=tz)
-            return dt.isoformat()
+            dt = datetime.fromisoformat(dt_str)
         except ValueError:
-            continue
+            pass
+        else:
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=LOCAL_TIMEZONE)
+            return dt.isoformat()
+    
+    # Otherwise pick the single format matching the string's shape
+    if ":" not in dt_str:
+        fmt = "%Y-%m-%d"
+    else:
+        fmt = _DATETIME_FORMATS.get(("T" if "T" in dt_str else " ", dt_str.count(":")))
+    
+    try:
+        dt = datetime.strptime(dt_str, fmt) if fmt else None
+    except ValueError:
+        dt = None
+    
+    if dt is None:
+        # If parsing fails, return as-is (let API handle errors)
+        return dt_str
     
-    # If parsing fails, return as-is (let API handle errors)
-    return dt_str
+    if fmt == "%Y-%m-%d":
+        # Only date provided, add default time
+        hour, minute, second = _parse_time_of_day(default_time)
+        dt = datetime(dt.year, dt.month, dt.day, hour, minute, second, tzinfo=LOCAL_TIMEZONE)
+    else:
+        dt = dt.replace(tzinfo=LOCAL_TIMEZONE)
+    return dt.isoformat()
 
 
+@_threaded
 @tool
 def create_calendar_event(
     title: str,
     start_time: str,
     end_time: str,
-    attendees: list[str] = [],
+    attendees: Optional[list[str]] = None,
     location: str = "",
     description: str = "",
 ) -> str:
@@ -94,14 +157,8 @@ def create_calendar_event(
         # Build event body
         event = {
             "summary": title,
-            "start": {
-                "dateTime": start_iso,
-                "timeZone": str(get_local_timezone()),
-            },
-            "end": {
-                "dateTime": end_iso,
-                "timeZone": str(get_local_timezone()),
-            },
+            "start": {"dateTime": start_iso, **_TZ_FIELD},
+            "end": {"dateTime": end_iso, **_TZ_FIELD},
         }
         
         if attendees:
@@ -119,33 +176,36 @@ def create_calendar_event(
             body=event,
             sendUpdates="all" if attendees else "none",
         ).execute()
+        invalidate_redis_cache("calendar")
         
         event_link = created_event.get("htmlLink", "")
-        attendee_count = len(attendees)
         
-        result = f"✅ Event created successfully!\n"
-        result += f"📅 Title: {title}\n"
-        result += f"🕐 Start: {start_time}\n"
-        result += f"🕑 End: {end_time}\n"
+        parts = [
+            "✅ Event created successfully!\n",
+            f"📅 Title: {title}\n",
+            f"🕐 Start: {start_time}\n",
+            f"🕑 End: {end_time}\n",
+        ]
         
         if attendees:
-            result += f"👥 Attendees: {', '.join(attendees)}\n"
+            parts.append(f"👥 Attendees: {', '.join(attendees)}\n")
         if location:
-            result += f"📍 Location: {location}\n"
+            parts.append(f"📍 Location: {location}\n")
         if event_link:
-            result += f"🔗 Link: {event_link}\n"
+            parts.append(f"🔗 Link: {event_link}\n")
             
-        return result
+        return "".join(parts)
         
     except Exception as e:
         return f"❌ Failed to create event: {str(e)}"
 
 
+@_threaded
 @tool
 def get_available_time_slots(
     date: str,
     duration_minutes: int = 60,
-    attendees: list[str] = [],
+    attendees: Optional[list[str]] = None,
     working_hours_start: int = 9,
     working_hours_end: int = 18,
 ) -> str:
@@ -164,67 +224,75 @@ def get_available_time_slots(
     """
     try:
         service = get_cached_calendar_service()
-        tz = get_local_timezone()
         
         # Parse the date
         try:
-            check_date = datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=tz)
+            check_date = datetime.strptime(date, "%Y-%m-%d")
         except ValueError:
             return f"❌ Invalid date format. Please use YYYY-MM-DD format."
         
         # Define time range
-        time_min = check_date.replace(hour=working_hours_start, minute=0, second=0)
-        time_max = check_date.replace(hour=working_hours_end, minute=0, second=0)
-        
-        # Get events for the day
-        events_result = service.events().list(
-            calendarId="primary",
-            timeMin=time_min.isoformat(),
-            timeMax=time_max.isoformat(),
-            singleEvents=True,
-            orderBy="startTime",
+        time_min = check_date.replace(tzinfo=LOCAL_TIMEZONE, hour=working_hours_start)
+        time_max = time_min.replace(hour=working_hours_end)
+        
+        # Query busy times for the user and all attendees in one request
+        calendar_ids = ["primary"] + [email.strip() for email in attendees or ()]
+        freebusy_result = service.freebusy().query(
+            body={
+                "timeMin": time_min.isoformat(),
+                "timeMax": time_max.isoformat(),
+                "items": [{"id": calendar_id} for calendar_id in calendar_ids],
+            }
         ).execute()
         
-        events = events_result.get("items", [])
-        
-        # Build list of busy periods
+        # Build list of busy periods across every calendar. Calendars the
+        # user cannot see come back with errors and no busy entries.
         busy_periods = []
-        for event in events:
-            start = event["start"].get("dateTime", event["start"].get("date"))
-            end = event["end"].get("dateTime", event["end"].get("date"))
-            
-            try:
-                start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
-                end_dt = datetime.fromisoformat(end.replace("Z", "+00:00"))
-                busy_periods.append((start_dt, end_dt))
-            except:
-                continue
-        
-        # Find available slots
+        for calendar in freebusy_result.get("calendars", {}).values():
+            for period in calendar.get("busy", []):
+                try:
+                    start_dt = datetime.fromisoformat(period["start"].replace("Z", "+00:00"))
+                    end_dt = datetime.fromisoformat(period["end"].replace("Z", "+00:00"))
+                    busy_periods.append((start_dt, end_dt))
+                except (KeyError, ValueError):
+                    continue
+        
+        # Merge overlapping busy periods into a sorted, disjoint list
+        busy_periods.sort(key=lambda period: period[0])
+        merged = []
+        for busy_start, busy_end in busy_periods:
+            if merged and busy_start <= merged[-1][1]:
+                if busy_end > merged[-1][1]:
+                    merged[-1][1] = busy_end
+            else:
+                merged.append([busy_start, busy_end])
+        
+        # Collect the free gaps between busy periods within working hours
+        free_gaps = []
+        cursor = time_min
+        for busy_start, busy_end in merged:
+            if busy_start > cursor:
+                free_gaps.append((cursor, min(busy_start, time_max)))
+            cursor = max(cursor, busy_end)
+        if cursor < time_max:
+            free_gaps.append((cursor, time_max))
+        
+        # Emit slots on the 30-minute grid inside each gap
         available_slots = []
-        current_time = time_min
         slot_duration = timedelta(minutes=duration_minutes)
+        step = timedelta(minutes=30)
         
-        while current_time + slot_duration <= time_max:
-            slot_end = current_time + slot_duration
-            
-            # Check if this slot conflicts with any busy period
-            is_available = True
-            for busy_start, busy_end in busy_periods:
-                if not (slot_end <= busy_start or current_time >= busy_end):
-                    is_available = False
-                    break
-            
-            if is_available:
+        for gap_start, gap_end in free_gaps:
+            # First grid point at or after the start of the gap
+            current_time = time_min + -((time_min - gap_start) // step) * step
+            while current_time + slot_duration <= gap_end:
                 available_slots.append(current_time.strftime("%H:%M"))
-            
-            # Move to next slot (30-minute increments)
-            current_time += timedelta(minutes=30)
+                current_time += step
         
         if available_slots:
-            result = f"📅 Available {duration_minutes}-minute slots on {date}:\n"
-            result += "\n".join([f"  • {slot}" for slot in available_slots])
-            return result
+            parts = [f"📅 Available {duration_minutes}-minute slots on {date}:"]
+            parts.extend(f"  • {slot}" for slot in available_slots)
+            return "\n".join(parts)
         else:
             return f"❌ No available {duration_minutes}-minute slots on {date} during working hours."
             
@@ -232,6 +300,7 @@ def get_available_time_slots(
         return f"❌ Failed to check availability: {str(e)}"
 
 
+@_threaded
 @tool
 def list_upcoming_events(days: int = 7, max_results: int = 10) -> str:
     """
@@ -246,9 +315,8 @@ def list_upcoming_events(days: int = 7, max_results: int = 10) -> str:
     """
     try:
         service = get_cached_calendar_service()
-        tz = get_local_timezone()
         
-        now = datetime.now(tz)
+        now = datetime.now(LOCAL_TIMEZONE)
         time_max = now + timedelta(days=days)
         
         events_result = service.events().list(
@@ -265,7 +333,7 @@ def list_upcoming_events(days: int = 7, max_results: int = 10) -> str:
         if not events:
             return f"📅 No upcoming events in the next {days} days."
         
-        result = f"📅 Upcoming events (next {days} days):\n\n"
+        parts = [f"📅 Upcoming events (next {days} days):\n\n"]
         
         for event in events:
             start = event["start"].get("dateTime", event["start"].get("date"))
@@ -274,31 +342,32 @@ def list_upcoming_events(days: int = 7, max_results: int = 10) -> str:
             # Parse and format the start time
             try:
                 start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
-                formatted_start = start_dt.strftime("%a, %b %d at %I:%M %p")
+                formatted_start = _format_event_start(start_dt)
             except:
                 formatted_start = start
             
-            result += f"• **{summary}**\n"
-            result += f"  📆 {formatted_start}\n"
+            parts.append(f"• **{summary}**\n  📆 {formatted_start}\n")
             
             if event.get("location"):
-                result += f"  📍 {event['location']}\n"
+                parts.append(f"  📍 {event['location']}\n")
             
-            result += "\n"
+            parts.append("\n")
         
-        return result
+        return "".join(parts)
         
     except Exception as e:
         return f"❌ Failed to list events: {str(e)}"
 
 
+@_threaded
 @tool
-def delete_calendar_event(event_id: str) -> str:
+def delete_calendar_event(event_id: str, title: Optional[str] = None) -> str:
     """
     Delete a calendar event by its ID.
     
     Args:
         event_id: The ID of the event to delete.
+        title: The event's title, if known, used in the confirmation message.
         
     Returns:
         Confirmation message.
@@ -306,22 +375,22 @@ def delete_calendar_event(event_id: str) -> str:
     try:
         service = get_cached_calendar_service()
         
-        # First, get the event to confirm it exists
+        # Delete directly; a missing event is reported by the API
         try:
-            event = service.events().get(calendarId="primary", eventId=event_id).execute()
-            event_title = event.get("summary", "Untitled Event")
-        except:
-            return f"❌ Event with ID '{event_id}' not found."
-        
-        # Delete the event
-        service.events().delete(calendarId="primary", eventId=event_id).execute()
+            service.events().delete(calendarId="primary", eventId=event_id).execute()
+        except HttpError as e:
+            if e.resp.status in _NOT_FOUND_STATUSES:
+                return f"❌ Event with ID '{event_id}' not found."
+            raise
+        invalidate_redis_cache("calendar")
         
-        return f"✅ Event '{event_title}' has been deleted successfully."
+        return f"✅ Event '{title or event_id}' has been deleted successfully."
         
     except Exception as e:
         return f"❌ Failed to delete event: {str(e)}"
 
 
+@_threaded
 @tool
 def update_calendar_event(
     event_id: str,
@@ -348,27 +417,17 @@ def update_calendar_event(
     try:
         service = get_cached_calendar_service()
         
-        # Get existing event
-        try:
-            event = service.events().get(calendarId="primary", eventId=event_id).execute()
-        except:
-            return f"❌ Event with ID '{event_id}' not found."
+        # Only the changed fields are sent, so no prior read is needed
+        event = {}
         
-        # Update fields
         if title is not None:
             event["summary"] = title
         
         if start_time is not None:
-            event["start"] = {
-                "dateTime": parse_datetime_to_iso(start_time),
-                "timeZone": str(get_local_timezone()),
-            }
+            event["start"] = {"dateTime": parse_datetime_to_iso(start_time), **_TZ_FIELD}
         
         if end_time is not None:
-            event["end"] = {
-                "dateTime": parse_datetime_to_iso(end_time),
-                "timeZone": str(get_local_timezone()),
-            }
+            event["end"] = {"dateTime": parse_datetime_to_iso(end_time), **_TZ_FIELD}
         
         if location is not None:
             event["location"] = location
@@ -376,12 +435,18 @@ def update_calendar_event(
         if description is not None:
             event["description"] = description
         
-        # Update the event
-        updated_event = service.events().update(
-            calendarId="primary",
-            eventId=event_id,
-            body=event,
-        ).execute()
+        # Patch the event
+        try:
+            updated_event = service.events().patch(
+                calendarId="primary",
+                eventId=event_id,
+                body=event,
+            ).execute()
+        except HttpError as e:
+            if e.resp.status in _NOT_FOUND_STATUSES:
+                return f"❌ Event with ID '{event_id}' not found."
+            raise
+        invalidate_redis_cache("calendar")
         
         return f"✅ Event updated successfully!\n📅 Title: {updated_event.get('summary', 'N/A')}"
         
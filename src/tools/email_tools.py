@@ -5,26 +5,156 @@ LangChain tools for interacting with Gmail API.
 """
 
 import base64
+import binascii
+import codecs
+import functools
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import Iterator, Optional
 
+try:
+    import pybase64
+except ImportError:  # Optional dependency: pip install pybase64
+    pybase64 = None
+
+from googleapiclient.errors import HttpError
 from langchain_core.tools import tool
 
+from src.cache import invalidate_redis_cache
 from src.tools.google_auth import get_cached_gmail_service
 from src.config import Config
 
 
+# Maximum number of sub-requests Gmail accepts in one batch request
+_BATCH_LIMIT = 100
+
+# HTTP statuses Gmail returns for messages deleted since they were listed
+_NOT_FOUND_STATUSES = (404, 410)
+
+# Retries (with exponential backoff) for sub-requests a batch failed to serve
+_RETRIES = 3
+
+# Headers shown for each message
+_SUMMARY_HEADERS = ("From", "Subject", "Date")
+_CONTENT_HEADERS = ("From", "To", "Subject", "Date")
+
+# Partial response mask for get_email_content: headers and inline part data only
+_CONTENT_FIELDS = "payload(headers(name,value),body/data,parts(mimeType,body/data))"
+
+# Number of body characters shown by get_email_content
+_BODY_PREVIEW_CHARS = 1000
+# Base64 characters covering the most UTF-8 bytes the preview can need (4 per char),
+# rounded up to whole 3-byte groups
+_BODY_PREVIEW_B64 = -(-_BODY_PREVIEW_CHARS * 4 // 3) * 4
+
+
+def _b64url_encode(data: bytes) -> str:
+    """Encode bytes as URL-safe base64 text (SIMD-accelerated when pybase64 is installed)."""
+    if pybase64 is not None:
+        return pybase64.urlsafe_b64encode(data).decode("ascii")
+    return base64.urlsafe_b64encode(data).decode("ascii")
+
+
+# Maps the URL-safe base64 alphabet onto the standard one
+_URLSAFE_TO_STD = bytes.maketrans(b"-_", b"+/")
+
+
+def _b64url_decode(data: str) -> bytes:
+    """Decode URL-safe base64 text from the Gmail API."""
+    if pybase64 is not None:
+        try:
+            # validate=True takes pybase64's fastest decoding path
+            return pybase64.b64decode(data, altchars=b"-_", validate=True)
+        except ValueError:
+            # Unpadded or otherwise irregular input; let the lenient decoder handle it
+            pass
+    # Extra padding is ignored, and makes unpadded input decodable
+    return binascii.a2b_base64(data.encode("ascii").translate(_URLSAFE_TO_STD) + b"==")
+
+
+# RFC 5322 line length limit, excluding the line ending
+_MAX_LINE_LENGTH = 998
+
+
+_utf8_decoder = codecs.getincrementaldecoder("utf-8")
+
+
+def _decode_body_preview(data: str) -> tuple[str, bool]:
+    """
+    Decode the start of a base64 message body.
+    
+    Only enough of the data to fill the preview is decoded.
+    
+    Returns:
+        Tuple of (preview text, whether the body was longer than the preview).
+    """
+    cut = len(data) > _BODY_PREVIEW_B64
+    if cut:
+        data = data[:_BODY_PREVIEW_B64]
+    # A multi-byte character may be split at the cut; hold back only its partial bytes
+    text = _utf8_decoder().decode(_b64url_decode(data), final=not cut)
+    return text[:_BODY_PREVIEW_CHARS], cut or bool(text[_BODY_PREVIEW_CHARS:_BODY_PREVIEW_CHARS + 1])
+
+
+def _find_headers(message: dict, names: tuple[str, ...]) -> dict[str, str]:
+    """Pick the named headers from a Gmail message, stopping once all are found."""
+    found = {}
+    for header in message.get("payload", {}).get("headers", ()):
+        name = header["name"]
+        if name in names and name not in found:
+            found[name] = header["value"]
+            if len(found) == len(names):
+                break
+    return found
+
+
+def _is_simple_header(value: str) -> bool:
+    """Check whether a header value can be written verbatim (ASCII, one short line)."""
+    return (
+        value.isascii()
+        and len(value) < _MAX_LINE_LENGTH - 10
+        and "\n" not in value
+        and "\r" not in value
+    )
+
+
+# Header block ending every directly written message, by body transfer encoding
+_PLAIN_7BIT_HEADERS = (
+    b"MIME-Version: 1.0\n"
+    b'Content-Type: text/plain; charset="utf-8"\n'
+    b"Content-Transfer-Encoding: 7bit\n\n"
+)
+_PLAIN_8BIT_HEADERS = _PLAIN_7BIT_HEADERS.replace(b"7bit", b"8bit")
+
+
+@functools.lru_cache(maxsize=1)
+def _from_line() -> bytes:
+    """Get the encoded From header line (the sender never changes)."""
+    return f"From: {Config.USER_EMAIL}\n".encode("ascii")
+
+
+def _build_mime_message(headers: list[tuple[str, str]], body: str) -> bytes:
+    """Build a message with the email package, which encodes non-ASCII and long headers."""
+    message = MIMEMultipart()
+    for name, value in headers:
+        message[name] = value
+    # Pinning the charset skips the trial ASCII encode; base64 keeps long lines legal
+    message.attach(MIMEText(body, "plain", "utf-8"))
+    return message.as_bytes()
+
+
 def create_message(
     to: list[str],
     subject: str,
     body: str,
-    cc: list[str] = [],
-    bcc: list[str] = [],
-    html: bool = False,
+    cc: Optional[list[str]] = None,
+    bcc: Optional[list[str]] = None,
 ) -> dict:
     """
-    Create an email message.
+    Create a plain-text email message.
+    
+    Messages with plain ASCII headers are written out directly as a single
+    text part; anything else goes through the email package.
     
     Args:
         to: List of recipient email addresses.
@@ -32,27 +162,38 @@ def create_message(
         body: Email body.
         cc: List of CC recipients.
         bcc: List of BCC recipients.
-        html: Whether the body is HTML.
         
     Returns:
         Message object for Gmail API.
     """
-    message = MIMEMultipart()
-    message["to"] = ", ".join(to)
-    message["subject"] = subject
-    message["from"] = Config.USER_EMAIL
-    
+    headers = [
+        ("To", ", ".join(to)),
+        ("Subject", subject),
+    ]
     if cc:
-        message["cc"] = ", ".join(cc)
+        headers.append(("Cc", ", ".join(cc)))
     if bcc:
-        message["bcc"] = ", ".join(bcc)
+        headers.append(("Bcc", ", ".join(bcc)))
+    
+    sender = Config.USER_EMAIL
+    body_bytes = body.encode("utf-8")
     
-    # Add body
-    mime_type = "html" if html else "plain"
-    message.attach(MIMEText(body, mime_type))
+    if (
+        _is_simple_header(sender)
+        and all(_is_simple_header(value) for _, value in headers)
+        and all(len(line) <= _MAX_LINE_LENGTH for line in body_bytes.split(b"\n"))
+    ):
+        raw_bytes = b"".join((
+            _from_line(),
+            "".join(f"{name}: {value}\n" for name, value in headers).encode("ascii"),
+            _PLAIN_7BIT_HEADERS if body.isascii() else _PLAIN_8BIT_HEADERS,
+            body_bytes,
+        ))
+    else:
+        raw_bytes = _build_mime_message([("From", sender), *headers], body)
     
     # Encode the message
-    raw = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
+    raw = _b64url_encode(raw_bytes)
     return {"raw": raw}
 
 
@@ -61,8 +202,8 @@ def send_email(
     to: list[str],
     subject: str,
     body: str,
-    cc: list[str] = [],
-    bcc: list[str] = [],
+    cc: Optional[list[str]] = None,
+    bcc: Optional[list[str]] = None,
 ) -> str:
     """
     Send an email using Gmail.
@@ -92,19 +233,18 @@ def send_email(
             userId="me",
             body=message,
         ).execute()
+        invalidate_redis_cache("email")
         
         message_id = sent_message.get("id", "N/A")
         
-        result = f"✅ Email sent successfully!\n"
-        result += f"📧 To: {', '.join(to)}\n"
-        result += f"📋 Subject: {subject}\n"
+        parts = [f"✅ Email sent successfully!\n📧 To: {', '.join(to)}\n📋 Subject: {subject}\n"]
         
         if cc:
-            result += f"📋 CC: {', '.join(cc)}\n"
+            parts.append(f"📋 CC: {', '.join(cc)}\n")
         
-        result += f"🆔 Message ID: {message_id}\n"
+        parts.append(f"🆔 Message ID: {message_id}\n")
         
-        return result
+        return "".join(parts)
         
     except Exception as e:
         return f"❌ Failed to send email: {str(e)}"
@@ -115,7 +255,7 @@ def draft_email(
     to: list[str],
     subject: str,
     body: str,
-    cc: list[str] = [],
+    cc: Optional[list[str]] = None,
 ) -> str:
     """
     Create an email draft in Gmail (does not send).
@@ -140,21 +280,119 @@ def draft_email(
             userId="me",
             body={"message": message},
         ).execute()
+        invalidate_redis_cache("email")
         
         draft_id = draft.get("id", "N/A")
         
-        result = f"✅ Draft created successfully!\n"
-        result += f"📧 To: {', '.join(to)}\n"
-        result += f"📋 Subject: {subject}\n"
-        result += f"🆔 Draft ID: {draft_id}\n"
-        result += f"💡 You can edit and send this draft from Gmail."
-        
-        return result
+        return (
+            f"✅ Draft created successfully!\n"
+            f"📧 To: {', '.join(to)}\n"
+            f"📋 Subject: {subject}\n"
+            f"🆔 Draft ID: {draft_id}\n"
+            f"💡 You can edit and send this draft from Gmail."
+        )
         
     except Exception as e:
         return f"❌ Failed to create draft: {str(e)}"
 
 
+def _is_not_found(exception: Exception) -> bool:
+    """Check whether an API error means the message no longer exists."""
+    return isinstance(exception, HttpError) and exception.resp.status in _NOT_FOUND_STATUSES
+
+
+def _fetch_summary_headers(service, messages: list[dict]) -> dict[str, Optional[dict]]:
+    """
+    Fetch summary headers for up to _BATCH_LIMIT messages in one batch request.
+    
+    Sub-requests that fail for reasons other than a deleted message (e.g.
+    rate limiting or server errors) are retried one by one with backoff.
+    
+    Returns:
+        Message details by ID; None for messages that could not be loaded.
+        Deleted messages are left out.
+    """
+    details: dict[str, Optional[dict]] = {}
+    failed: list[str] = []
+    
+    def _get(message_id: str):
+        return service.users().messages().get(
+            userId="me",
+            id=message_id,
+            format="metadata",
+            metadataHeaders=list(_SUMMARY_HEADERS),
+        )
+    
+    def _collect(request_id, response, exception):
+        if exception is None:
+            details[request_id] = response
+        elif not _is_not_found(exception):
+            failed.append(request_id)
+    
+    batch = service.new_batch_http_request(callback=_collect)
+    for msg in messages:
+        batch.add(_get(msg["id"]), request_id=msg["id"])
+    batch.execute()
+    
+    for message_id in failed:
+        try:
+            details[message_id] = _get(message_id).execute(num_retries=_RETRIES)
+        except Exception as e:
+            if not _is_not_found(e):
+                details[message_id] = None
+    
+    return details
+
+
+def _format_summary(msg_detail: dict) -> str:
+    """Format one search result."""
+    headers = _find_headers(msg_detail, _SUMMARY_HEADERS)
+    
+    from_addr = headers.get("From", "Unknown")
+    subject = headers.get("Subject", "No Subject")
+    date = headers.get("Date", "Unknown")
+    
+    # Truncate long subjects
+    if subject[50:51]:
+        subject = subject[:47] + "..."
+    
+    return f"• **{subject}**\n  From: {from_addr}\n  Date: {date}\n\n"
+
+
+def _search_emails_iter(query: str, max_results: int) -> Iterator[Optional[str]]:
+    """
+    Yield formatted summaries of emails matching a query, in search order.
+    
+    Results are listed page by page and their headers are fetched one batch
+    at a time, so a caller that stops early skips the remaining requests.
+    Messages deleted meanwhile are skipped; messages that could not be
+    loaded (e.g. after repeated rate limiting) are yielded as None.
+    
+    Args:
+        query: Search query (Gmail search syntax).
+        max_results: Maximum number of messages to look at.
+    """
+    service = get_cached_gmail_service()
+    messages_api = service.users().messages()
+    
+    remaining = max_results
+    request = messages_api.list(userId="me", q=query, maxResults=max_results)
+    while request is not None and remaining > 0:
+        response = request.execute()
+        messages = response.get("messages", [])[:remaining]
+        remaining -= len(messages)
+        
+        for start in range(0, len(messages), _BATCH_LIMIT):
+            chunk = messages[start:start + _BATCH_LIMIT]
+            details = _fetch_summary_headers(service, chunk)
+            for msg in chunk:
+                if msg["id"] in details:
+                    detail = details[msg["id"]]
+                    yield _format_summary(detail) if detail is not None else None
+        
+        request = messages_api.list_next(request, response)
+
+
 @tool
 def search_emails(
     query: str,
@@ -172,51 +410,66 @@ def search_emails(
         List of matching emails with summaries.
     """
     try:
-        service = get_cached_gmail_service()
-        
-        # Search for messages
-        results = service.users().messages().list(
-            userId="me",
-            q=query,
-            maxResults=max_results,
-        ).execute()
+        results = list(_search_emails_iter(query, max_results))
+        summaries = [summary for summary in results if summary is not None]
+        missing = len(results) - len(summaries)
         
-        messages = results.get("messages", [])
-        
-        if not messages:
+        if not results:
             return f"📭 No emails found matching: '{query}'"
         
-        result = f"📬 Found {len(messages)} email(s) matching '{query}':\n\n"
-        
-        for msg in messages:
-            # Get message details
-            msg_detail = service.users().messages().get(
-                userId="me",
-                id=msg["id"],
-                format="metadata",
-                metadataHeaders=["From", "Subject", "Date"],
-            ).execute()
-            
-            headers = {h["name"]: h["value"] for h in msg_detail.get("payload", {}).get("headers", [])}
-            
-            from_addr = headers.get("From", "Unknown")
-            subject = headers.get("Subject", "No Subject")
-            date = headers.get("Date", "Unknown")
-            
-            # Truncate long subjects
-            if len(subject) > 50:
-                subject = subject[:47] + "..."
-            
-            result += f"• **{subject}**\n"
-            result += f"  From: {from_addr}\n"
-            result += f"  Date: {date}\n\n"
-        
-        return result
+        output = f"📬 Found {len(results)} email(s) matching '{query}':\n\n" + "".join(summaries)
+        if missing:
+            output += f"⚠️ {missing} result(s) could not be loaded; try again shortly.\n"
+        return output
         
     except Exception as e:
         return f"❌ Failed to search emails: {str(e)}"
 
 
+@functools.lru_cache(maxsize=256)
+def _fetch_and_format(message_id: str) -> str:
+    """Fetch and format an email. Gmail messages never change, so results are cached by ID."""
+    service = get_cached_gmail_service()
+    
+    # Get full message
+    message = service.users().messages().get(
+        userId="me",
+        id=message_id,
+        format="full",
+        fields=_CONTENT_FIELDS,
+    ).execute()
+    
+    # Extract headers
+    headers = _find_headers(message, _CONTENT_HEADERS)
+    
+    from_addr = headers.get("From", "Unknown")
+    to_addr = headers.get("To", "Unknown")
+    subject = headers.get("Subject", "No Subject")
+    date = headers.get("Date", "Unknown")
+    
+    # Extract body
+    body, is_truncated = "", False
+    payload = message.get("payload", {})
+    
+    if "body" in payload and payload["body"].get("data"):
+        body, is_truncated = _decode_body_preview(payload["body"]["data"])
+    elif "parts" in payload:
+        for part in payload["parts"]:
+            if part.get("mimeType") == "text/plain" and part.get("body", {}).get("data"):
+                body, is_truncated = _decode_body_preview(part["body"]["data"])
+                break
+    
+    truncated = "\n\n... (truncated)" if is_truncated else ""
+    
+    return (
+        f"📧 **{subject}**\n\n"
+        f"From: {from_addr}\n"
+        f"To: {to_addr}\n"
+        f"Date: {date}\n\n"
+        f"---\n\n{body}{truncated}"
+    )
+
+
 @tool
 def get_email_content(message_id: str) -> str:
     """
@@ -229,45 +482,6 @@ def get_email_content(message_id: str) -> str:
         Email content with headers and body.
     """
     try:
-        service = get_cached_gmail_service()
-        
-        # Get full message
-        message = service.users().messages().get(
-            userId="me",
-            id=message_id,
-            format="full",
-        ).execute()
-        
-        # Extract headers
-        headers = {h["name"]: h["value"] for h in message.get("payload", {}).get("headers", [])}
-        
-        from_addr = headers.get("From", "Unknown")
-        to_addr = headers.get("To", "Unknown")
-        subject = headers.get("Subject", "No Subject")
-        date = headers.get("Date", "Unknown")
-        
-        # Extract body
-        body = ""
-        payload = message.get("payload", {})
-        
-        if "body" in payload and payload["body"].get("data"):
-            body = base64.urlsafe_b64decode(payload["body"]["data"]).decode("utf-8")
-        elif "parts" in payload:
-            for part in payload["parts"]:
-                if part.get("mimeType") == "text/plain" and part.get("body", {}).get("data"):
-                    body = base64.urlsafe_b64decode(part["body"]["data"]).decode("utf-8")
-                    break
-        
-        result = f"📧 **{subject}**\n\n"
-        result += f"From: {from_addr}\n"
-        result += f"To: {to_addr}\n"
-        result += f"Date: {date}\n\n"
-        result += f"---\n\n{body[:1000]}"
-        
-        if len(body) > 1000:
-            result += "\n\n... (truncated)"
-        
-        return result
-        
+        return _fetch_and_format(message_id)
     except Exception as e:
         return f"❌ Failed to get email: {str(e)}"
@@ -5,6 +5,7 @@ Handles OAuth 2.0 flow for Google Calendar and Gmail APIs.
 """
 
 import os
+import threading
 from pathlib import Path
 from typing import Tuple, Optional
 
@@ -13,7 +14,13 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build, Resource
 
+from src._fastjson import FastJsonModel
 from src.config import GOOGLE_SCOPES, get_credentials_path, get_token_path
+from src.tools.google_http import get_shared_http
+
+
+# Credentials loaded by get_google_credentials, reused while valid
+_creds: Optional[Credentials] = None
 
 
 def get_google_credentials() -> Credentials:
@@ -25,18 +32,24 @@ def get_google_credentials() -> Credentials:
     2. If credentials are expired but refreshable, refresh them
     3. Otherwise, start the OAuth flow to get new credentials
     
+    The result is kept in memory and returned directly while it stays valid.
+    
     Returns:
         Valid Google OAuth credentials.
         
     Raises:
         FileNotFoundError: If credentials.json is not found.
     """
-    creds = None
+    global _creds
+    if _creds is not None and _creds.valid:
+        return _creds
+    
+    creds = _creds
     token_path = get_token_path()
     credentials_path = get_credentials_path()
     
     # Check if we have saved credentials
-    if token_path.exists():
+    if creds is None and token_path.exists():
         creds = Credentials.from_authorized_user_file(str(token_path), GOOGLE_SCOPES)
     
     # If no valid credentials, get new ones
@@ -62,13 +75,26 @@ def get_google_credentials() -> Credentials:
             )
             creds = flow.run_local_server(port=0)
         
-        # Save credentials for next run
+        # Save credentials for next run (only reached when they changed)
         with open(token_path, "w") as token:
             token.write(creds.to_json())
     
+    _creds = creds
     return creds
 
 
+def _build(service_name: str, version: str, http) -> Resource:
+    """Build a service from the discovery document bundled with the client library."""
+    return build(
+        service_name,
+        version,
+        http=http,
+        model=FastJsonModel(),
+        cache_discovery=False,
+        static_discovery=True,
+    )
+
+
 def get_google_services() -> Tuple[Resource, Resource]:
     """
     Get authenticated Google Calendar and Gmail service instances.
@@ -80,42 +106,56 @@ def get_google_services() -> Tuple[Resource, Resource]:
         >>> calendar, gmail = get_google_services()
         >>> events = calendar.events().list(calendarId='primary').execute()
     """
-    creds = get_google_credentials()
+    # Resolve credentials first so the OAuth flow can only run once
+    http = get_shared_http(get_google_credentials())
     
-    calendar_service = build("calendar", "v3", credentials=creds)
-    gmail_service = build("gmail", "v1", credentials=creds)
-    
-    return calendar_service, gmail_service
+    return _build("calendar", "v3", http), _build("gmail", "v1", http)
 
 
 def get_calendar_service() -> Resource:
     """Get authenticated Google Calendar service."""
-    creds = get_google_credentials()
-    return build("calendar", "v3", credentials=creds)
+    http = get_shared_http(get_google_credentials())
+    return _build("calendar", "v3", http)
 
 
 def get_gmail_service() -> Resource:
     """Get authenticated Gmail service."""
-    creds = get_google_credentials()
-    return build("gmail", "v1", credentials=creds)
+    http = get_shared_http(get_google_credentials())
+    return _build("gmail", "v1", http)
 
 
 # Cached service instances
 _calendar_service: Optional[Resource] = None
 _gmail_service: Optional[Resource] = None
+_service_lock = threading.Lock()
+
+
+def _build_cached_services():
+    """Build both cached services from one credentials load. Call with _service_lock held."""
+    global _calendar_service, _gmail_service
+    _calendar_service, _gmail_service = get_google_services()
 
 
 def get_cached_calendar_service() -> Resource:
     """Get cached Google Calendar service (creates on first call)."""
-    global _calendar_service
-    if _calendar_service is None:
-        _calendar_service = get_calendar_service()
-    return _calendar_service
+    service = _calendar_service
+    if service is not None:
+        return service
+    
+    # Only one thread may build the services (and possibly run the OAuth flow)
+    with _service_lock:
+        if _calendar_service is None:
+            _build_cached_services()
+        return _calendar_service
 
 
 def get_cached_gmail_service() -> Resource:
     """Get cached Gmail service (creates on first call)."""
-    global _gmail_service
-    if _gmail_service is None:
-        _gmail_service = get_gmail_service()
-    return _gmail_service
+    service = _gmail_service
+    if service is not None:
+        return service
+    
+    with _service_lock:
+        if _gmail_service is None:
+            _build_cached_services()
+        return _gmail_service
@@ -0,0 +1,73 @@
+"""
+Shared HTTP Transport for Google APIs.
+
+A pool of authorized, keep-alive HTTP clients reused by every Google API
+service, so connections and credential refreshes are shared across tool
+calls. httplib2 connections are not thread-safe, so each request checks a
+client out of the pool and returns it afterwards: clients move between
+threads but are never used by two at once.
+"""
+
+import queue
+from typing import Optional
+
+import httplib2
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
+
+
+# Socket timeout in seconds (httplib2 defaults to none, which can hang a tool call)
+HTTP_TIMEOUT = 30
+
+
+class _PooledHttp:
+    """
+    Transport that runs each request on a client checked out of a pool.
+    
+    Services built with this transport can be shared between threads; the
+    credentials object (and therefore token refreshes) is shared by all.
+    """
+    
+    def __init__(self, credentials: Credentials):
+        self.credentials = credentials
+        # Most recently returned client first, so its connection is the warmest
+        self._pool: "queue.LifoQueue[AuthorizedHttp]" = queue.LifoQueue()
+        # Source of read-only settings for callers that inspect the transport
+        self._template = self._new_http()
+        self._pool.put(self._template)
+    
+    def _new_http(self) -> AuthorizedHttp:
+        return AuthorizedHttp(self.credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+    
+    def request(self, *args, **kwargs):
+        try:
+            http = self._pool.get_nowait()
+        except queue.Empty:
+            http = self._new_http()
+        try:
+            return http.request(*args, **kwargs)
+        finally:
+            self._pool.put(http)
+    
+    def __getattr__(self, name):
+        return getattr(self._template, name)
+
+
+# Shared transport instance
+_shared_http: Optional[_PooledHttp] = None
+
+
+def get_shared_http(credentials: Credentials) -> _PooledHttp:
+    """
+    Get the shared authorized HTTP transport (creates on first call).
+    
+    Args:
+        credentials: Google OAuth credentials used to authorize requests.
+        
+    Returns:
+        A transport that refreshes the credentials when they expire.
+    """
+    global _shared_http
+    if _shared_http is None:
+        _shared_http = _PooledHttp(credentials)
+    return _shared_http
@@ -0,0 +1,7 @@
+"""Terminal UI package for the Personal Assistant."""
+
+from src.ui.console import console
+
+__all__ = [
+    "console",
+]
@@ -0,0 +1,21 @@
+"""
+Shared Rich Console.
+
+A single themed console used by both the interactive CLI and the demo.
+"""
+
+from rich.console import Console
+from rich.theme import Theme
+
+
+# Custom theme for rich console
+custom_theme = Theme({
+    "info": "cyan",
+    "warning": "yellow",
+    "error": "red bold",
+    "success": "green",
+    "user": "bold blue",
+    "assistant": "bold magenta",
+})
+
+console = Console(theme=custom_theme)
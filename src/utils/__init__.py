@@ -0,0 +1,9 @@
+"""Utilities package for the Personal Assistant."""
+
+from src.utils.time import LOCAL_TIMEZONE, LOCAL_TIMEZONE_NAME, get_current_datetime_str
+
+__all__ = [
+    "LOCAL_TIMEZONE",
+    "LOCAL_TIMEZONE_NAME",
+    "get_current_datetime_str",
+]
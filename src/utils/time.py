@@ -0,0 +1,18 @@
+"""
+Time Utilities.
+
+Shared timezone and datetime formatting helpers.
+"""
+
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+
+# Default to IST for India, adjust as needed
+LOCAL_TIMEZONE_NAME = "Asia/Kolkata"
+LOCAL_TIMEZONE = ZoneInfo(LOCAL_TIMEZONE_NAME)
+
+
+def get_current_datetime_str() -> str:
+    """Get current datetime as a formatted string."""
+    return datetime.now(LOCAL_TIMEZONE).strftime("%A, %B %d, %Y at %I:%M %p %Z")
@@ -0,0 +1,31 @@
+"""Tests for routing single-domain requests straight to a sub-agent."""
+
+import pytest
+
+from src.agents.supervisor import calendar_agent_tool, email_agent_tool, route_directly
+
+
+@pytest.mark.parametrize(
+    "request_text, expected",
+    [
+        # Calendar
+        ("What's on my calendar?", calendar_agent_tool),
+        ("what meetings do I have", calendar_agent_tool),
+        ("list my events", calendar_agent_tool),
+        ("Am I free on Friday afternoon?", calendar_agent_tool),
+        ("Schedule a meeting tomorrow at 2pm", calendar_agent_tool),
+        # Email
+        ("search emails from bob", email_agent_tool),
+        ("Check my inbox", email_agent_tool),
+        ("show my drafts", email_agent_tool),
+        ("any replies from Alice?", email_agent_tool),
+        ("Send a note to bob@example.com", email_agent_tool),
+        # Left to the supervisor
+        ("Schedule a meeting and email the team", None),
+        ("Move it to Friday", None),
+        ("email me my calendar", None),
+        ("hello", None),
+    ],
+)
+def test_route_directly(request_text, expected):
+    assert route_directly(request_text) is expected